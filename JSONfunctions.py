@@ -1,17 +1,131 @@
 import json
 import os
 import shutil
+import tempfile
+import time
+from contextlib import contextmanager
 
-def load_json_data(filename):
+try:
+    import fcntl
+except ImportError:
+    # Нет fcntl (Windows) - блокировки между процессами не работают, остается только атомарная запись
+    fcntl = None
+
+# Блокировки файлов, которые уже держит этот процесс: {filename: [файл блокировки, исключительная ли, глубина]}.
+# Вложенные load/save внутри json_transaction берут уже захваченную блокировку.
+# Внутри блокировки нельзя делать await: другая корутина этого же процесса встала бы в flock и остановила цикл событий
+held_locks = {}
+
+# Наблюдатели операций с файлами данных (метрики, учет ввода-вывода):
+# функции (операция 'load'/'save', filename, секунды, байт)
+storage_observers = []
+
+@contextmanager
+def file_lock(filename, exclusive=False):
+    """Совместная (чтение) или исключительная (запись) блокировка файла данных между процессами"""
+    held = held_locks.get(filename)
+    if held:
+        # Повышение совместной блокировки до исключительной в flock не атомарно: между ними успел бы записать
+        # другой процесс. Поэтому запись берет исключительную блокировку сразу (json_transaction, save_json_data)
+        if exclusive and not held[1]:
+            raise RuntimeError(f"Запись {filename} внутри блокировки на чтение")
+        held[2] += 1
+        try:
+            yield
+        finally:
+            held[2] -= 1
+        return
+
+    # Отдельный файл блокировки: сам файл данных подменяется через os.replace
+    lock_file = open('data/'+filename+'.json.lock', 'a')
     try:
-        with open('data/'+filename+'.json', 'r', encoding='utf-8') as file:
-            return json.load(file)
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        held_locks[filename] = [lock_file, exclusive, 1]
+        try:
+            yield
+        finally:
+            del held_locks[filename]
+    finally:
+        lock_file.close()
+
+def read_json(filename):
+    """Читает и разбирает файл данных (под блокировкой). Возвращает (данные, исходные байты)"""
+    started = time.perf_counter()
+    try:
+        with open('data/'+filename+'.json', 'rb') as file:
+            raw = file.read()
     except FileNotFoundError:
-        return {"users": {}}
+        raw = None
+    data = json.loads(raw) if raw is not None else empty_data()
+    notify_storage_observers('load', filename, time.perf_counter() - started, len(raw or b''))
+    return data, raw
+
+def empty_data():
+    """Данные отсутствующего файла"""
+    return {"users": {}}
+
+def dump_json(data):
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def write_json_bytes(raw, filename):
+    """Атомарная запись: читатели видят либо старый, либо новый файл целиком"""
+    path = 'data/'+filename+'.json'
+    fd, temp_path = tempfile.mkstemp(dir='data', prefix=filename+'.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(raw)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp создает файл с правами 0600 - сохраняем права прежнего файла
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def notify_storage_observers(operation, filename, seconds, size):
+    for observer in storage_observers:
+        observer(operation, filename, seconds, size)
+
+def load_json_data(filename):
+    with file_lock(filename):
+        data, _ = read_json(filename)
+    return data
 
 def save_json_data(data, filename):
-    with open('data/'+filename+'.json', 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=2)
+    started = time.perf_counter()
+    raw = dump_json(data)
+    with file_lock(filename, exclusive=True):
+        write_json_bytes(raw, filename)
+    notify_storage_observers('save', filename, time.perf_counter() - started, len(raw))
+
+@contextmanager
+def json_transaction(filename):
+    """Чтение-изменение-запись файла под исключительной блокировкой.
+    Данные сохраняются при выходе из блока, если они изменились и не было исключения"""
+    with file_lock(filename, exclusive=True):
+        data, original_raw = read_json(filename)
+        yield data
+        started = time.perf_counter()
+        raw = dump_json(data)
+        # Файла не было и данные не изменились - не создаем его ради пустой структуры
+        if original_raw is None:
+            original_raw = dump_json(empty_data())
+        if raw != original_raw:
+            write_json_bytes(raw, filename)
+            notify_storage_observers('save', filename, time.perf_counter() - started, len(raw))
+
+def get_data_version(filename):
+    """Версия файла данных (время изменения и размер) - для сброса кэшей после записи другим процессом"""
+    try:
+        stat = os.stat('data/'+filename+'.json')
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
         
 
 
@@ -35,17 +149,13 @@ async def send_leaderboard(filename):
 
 def get_next_counter():
     """Получить следующий номер для генерации PDF"""
-    data = load_json_data('counters')
-    
-    # Инициализируем счетчик если его нет
-    if 'pdf_counter' not in data:
-        data['pdf_counter'] = 0
-    
-    # Увеличиваем счетчик
-    data['pdf_counter'] += 1
-    
-    # Сохраняем изменения
-    save_json_data(data, 'counters')
+    with json_transaction('counters') as data:
+        # Инициализируем счетчик если его нет
+        if 'pdf_counter' not in data:
+            data['pdf_counter'] = 0
+        
+        # Увеличиваем счетчик
+        data['pdf_counter'] += 1
     
     return data['pdf_counter']
 
@@ -0,0 +1,122 @@
+from JSONfunctions import load_json_data
+from schedule_model import get_compiled_schedule, APPOINTMENT_TYPES
+from slot_holds import get_held_slots
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+
+def get_doctor_appointments(doctor_id: int, appointments_data: Optional[dict] = None) -> List[dict]:
+    """Возвращает все записи врача по его списку ID (без просмотра всех записей)"""
+    if appointments_data is None:
+        appointments_data = load_json_data('appointments')
+    
+    all_appointments = appointments_data.get("appointments", {})
+    doctor_entry = appointments_data.get("doctors", {}).get(str(doctor_id), {})
+    
+    doctor_appointments = []
+    for appointment_id in doctor_entry.get("appointments", []):
+        appointment = all_appointments.get(appointment_id)
+        if appointment:
+            doctor_appointments.append(appointment)
+    
+    return doctor_appointments
+
+def build_doctor_day_index(doctor_id: int, appointments_data: Optional[dict] = None) -> Dict[str, List[dict]]:
+    """Строит индекс записей врача по датам: {"ГГГГ-ММ-ДД": [записи, отсортированные по времени]}"""
+    day_index = {}
+    for appointment in get_doctor_appointments(doctor_id, appointments_data):
+        day_index.setdefault(appointment["date"], []).append(appointment)
+    
+    for day_appointments in day_index.values():
+        day_appointments.sort(key=lambda x: x["time_slot"])
+    
+    return day_index
+
+def get_doctor_appointments_on_date(doctor_id: int, date_str: str, appointments_data: Optional[dict] = None) -> List[dict]:
+    """Возвращает записи врача на указанную дату"""
+    return build_doctor_day_index(doctor_id, appointments_data).get(date_str, [])
+
+def get_doctor_appointments_in_range(doctor_id: int, start_date: str, end_date: str,
+                                     appointments_data: Optional[dict] = None) -> Dict[str, List[dict]]:
+    """Возвращает записи врача за период [start_date, end_date] (ISO-даты), сгруппированные по датам"""
+    day_index = build_doctor_day_index(doctor_id, appointments_data)
+    return {
+        date_str: day_appointments
+        for date_str, day_appointments in day_index.items()
+        if start_date <= date_str <= end_date
+    }
+
+def map_appointments_by_start(appointments: List[dict]) -> Dict[str, dict]:
+    """Сопоставляет записи с началом интервала ("ЧЧ:ММ"), активные записи важнее отмененных"""
+    by_start = {}
+    for appointment in appointments:
+        start = appointment.get("time_slot", "").split('-')[0]
+        current = by_start.get(start)
+        if current is None or current.get("status") == "cancelled":
+            by_start[start] = appointment
+    return by_start
+
+def remove_appointments(appointments_data: dict, appointment_ids) -> List[dict]:
+    """Удаляет записи из загруженных данных (без сохранения) и возвращает удаленные"""
+    appointment_ids = set(appointment_ids)
+    all_appointments = appointments_data.get("appointments", {})
+    
+    removed = []
+    for appointment_id in appointment_ids:
+        appointment = all_appointments.pop(appointment_id, None)
+        if appointment:
+            removed.append(appointment)
+    
+    # Списки врачей чистим по одному разу на врача
+    for doctor_id in {appointment["doctor_id"] for appointment in removed}:
+        doctor_entry = appointments_data.get("doctors", {}).get(doctor_id)
+        if doctor_entry and "appointments" in doctor_entry:
+            doctor_entry["appointments"] = [
+                app_id for app_id in doctor_entry["appointments"]
+                if app_id not in appointment_ids
+            ]
+    
+    return removed
+
+def get_free_slots(doctor_id: int, day: date, appointment_type: str,
+                   day_index: Optional[Dict[str, List[dict]]] = None) -> List[str]:
+    """Возвращает свободные слоты врача на день для типа приема
+    (по расписанию за вычетом занятых и временно закрепленных за пациентами)"""
+    compiled_schedule = get_compiled_schedule(doctor_id)
+    if not compiled_schedule:
+        return []
+    
+    if day_index is None:
+        day_index = build_doctor_day_index(doctor_id)
+    
+    booked = {
+        appointment["time_slot"]
+        for appointment in day_index.get(day.isoformat(), [])
+        if appointment["status"] != "cancelled"
+    }
+    booked |= get_held_slots(doctor_id, day.isoformat())
+    return [label for _, _, label in compiled_schedule.slots_for(day, appointment_type) if label not in booked]
+
+def plan_day_move(doctor_id: int, appointments: List[dict], target_day: date,
+                  day_index: Optional[Dict[str, List[dict]]] = None) -> Optional[List[Tuple[dict, str]]]:
+    """Подбирает записям свободные слоты того же типа на другой день.
+    Возвращает [(запись, новый слот)] или None, если мест не хватает хотя бы для одной записи"""
+    if day_index is None:
+        day_index = build_doctor_day_index(doctor_id)
+    
+    plan = []
+    for appointment_type in APPOINTMENT_TYPES:
+        type_appointments = sorted(
+            (appointment for appointment in appointments if appointment["appointment_type"] == appointment_type),
+            key=lambda x: x["time_slot"]
+        )
+        if not type_appointments:
+            continue
+        
+        free_slots = get_free_slots(doctor_id, target_day, appointment_type, day_index)
+        if len(free_slots) < len(type_appointments):
+            return None
+        
+        # Порядок записей сохраняется: первая запись дня - в первый свободный слот
+        plan.extend(zip(type_appointments, free_slots))
+    
+    return plan
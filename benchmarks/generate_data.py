@@ -0,0 +1,161 @@
+# Генератор синтетических data/users.json, schedules.json и appointments.json заданного масштаба.
+# Пример: python benchmarks/generate_data.py --workdir /tmp/bench --doctors 20000 --patients 200000 --appointments 2000000
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JSONfunctions import save_json_data
+from schedule_model import compile_period
+from weekend_rules import rules_from_user, is_day_off
+
+LAST_NAMES = ["Иванов", "Петров", "Сидоров", "Смирнов", "Кузнецов", "Попов", "Волков", "Соколов", "Лебедев", "Козлов"]
+FIRST_NAMES = ["Александр", "Дмитрий", "Максим", "Сергей", "Андрей", "Алексей", "Иван", "Михаил", "Олег", "Павел"]
+MIDDLE_NAMES = ["Александрович", "Дмитриевич", "Сергеевич", "Андреевич", "Иванович", "Петрович", "Олегович"]
+SPECIALTIES = ["Терапевт", "Кардиолог", "Невролог", "Хирург", "Офтальмолог", "Дерматолог", "Педиатр", "Эндокринолог"]
+STREETS = ["Ленина", "Мира", "Гагарина", "Советская", "Садовая", "Лесная", "Школьная", "Набережная"]
+
+# Варианты расписаний: (длительность приема, начало/конец первичного, начало/конец повторного)
+SCHEDULE_TEMPLATES = [
+    (20, "09:00", "13:00", "14:00", "17:00"),
+    (30, "08:00", "12:00", "13:00", "18:00"),
+    (15, "10:00", "14:00", "15:00", "19:00"),
+]
+
+def make_fio(rng: random.Random) -> str:
+    return f"{rng.choice(LAST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(MIDDLE_NAMES)}"
+
+def make_user(rng: random.Random, user_id: int, role: str) -> dict:
+    """Запись пользователя в формате save_registration_data"""
+    is_doctor = role == "doctor"
+    birth_date = date(1950, 1, 1) + timedelta(days=rng.randint(0, 20000))
+    return {
+        "user_id": str(user_id),
+        "version": 1,
+        "username": f"user{user_id}",
+        "first_name": "",
+        "last_name": "",
+        "registration_data": {
+            "role": role,
+            "fio": make_fio(rng),
+            "birth_date": birth_date.strftime("%d.%m.%Y"),
+            "phone": f"+79{rng.randint(100000000, 999999999)}",
+            "office_address": f"ул. {rng.choice(STREETS)}, {rng.randint(1, 200)}" if is_doctor else "Не требуется",
+            "specialty": rng.choice(SPECIALTIES) if is_doctor else "Не требуется",
+            "website_link": f"https://clinic.example/{user_id}" if is_doctor else "Не требуется",
+            "photo_file_id": None,
+            "registration_date": datetime(2024, 1, 1).isoformat()
+        }
+    }
+
+def generate(doctors: int, patients: int, appointments: int, days: int, seed: int):
+    """Строит данные всех трех файлов"""
+    rng = random.Random(seed)
+    today = date.today()
+
+    doctor_ids = list(range(1_000_000, 1_000_000 + doctors))
+    patient_ids = list(range(5_000_000, 5_000_000 + patients))
+
+    users = {str(user_id): make_user(rng, user_id, "doctor") for user_id in doctor_ids}
+    users.update({str(user_id): make_user(rng, user_id, "patient") for user_id in patient_ids})
+
+    # Выходные: у части врачей - каждое воскресенье
+    for user_id in doctor_ids:
+        users[str(user_id)]["weekends"] = []
+        users[str(user_id)]["weekend_rules"] = {
+            "weekday_mask": 1 << 6 if rng.random() < 0.5 else 0,
+            "monthly": [],
+            "exclude": []
+        }
+
+    schedules = {}
+    doctor_slots = {}
+    for user_id in doctor_ids:
+        patient_time, primary_start, primary_end, repeat_start, repeat_end = rng.choice(SCHEDULE_TEMPLATES)
+        schedules[str(user_id)] = {
+            "patient_time": patient_time,
+            "primary_start": primary_start,
+            "primary_end": primary_end,
+            "repeat_start": repeat_start,
+            "repeat_end": repeat_end,
+            "version": 1
+        }
+        doctor_slots[user_id] = {
+            "primary": [label for _, _, label in compile_period(primary_start, primary_end, patient_time)],
+            "repeat": [label for _, _, label in compile_period(repeat_start, repeat_end, patient_time)]
+        }
+
+    # Записи равномерно по врачам (остаток - по одной первым врачам), в пределах [сегодня - days, сегодня + days],
+    # только в рабочие дни врача и без двойного бронирования слота
+    all_appointments = {}
+    doctor_appointments = {str(user_id): {"appointments": []} for user_id in doctor_ids}
+    per_doctor, remainder = divmod(appointments, max(doctors, 1))
+    period = [today + timedelta(days=offset) for offset in range(-days, days + 1)]
+    created_at = datetime.now().isoformat()
+
+    for index, user_id in enumerate(doctor_ids):
+        taken = set()
+        slots = doctor_slots[user_id]
+        rules = rules_from_user(users[str(user_id)])
+        working_days = [day for day in period if not is_day_off(rules, day)]
+        capacity = len(working_days) * (len(slots["primary"]) + len(slots["repeat"]))
+        doctor_count = per_doctor + (1 if index < remainder else 0)
+
+        for _ in range(min(doctor_count, capacity)):
+            while True:
+                day = rng.choice(working_days)
+                appointment_type = "primary" if rng.random() < 0.6 else "repeat"
+                time_slot = rng.choice(slots[appointment_type])
+                if (day, time_slot) not in taken:
+                    taken.add((day, time_slot))
+                    break
+
+            patient = users[str(rng.choice(patient_ids))]
+            appointment_id = f"app_{len(all_appointments)}_{rng.randint(1000, 9999)}"
+            all_appointments[appointment_id] = {
+                "appointment_id": appointment_id,
+                "patient_id": patient["user_id"],
+                "patient_fio": patient["registration_data"]["fio"],
+                "patient_birth_date": patient["registration_data"]["birth_date"],
+                "patient_phone": patient["registration_data"]["phone"],
+                "doctor_id": str(user_id),
+                "date": day.isoformat(),
+                "time_slot": time_slot,
+                "appointment_type": appointment_type,
+                "status": rng.choice(("pending", "pending", "confirmed", "cancelled")),
+                "created_at": created_at
+            }
+            doctor_appointments[str(user_id)]["appointments"].append(appointment_id)
+
+    return (
+        {"users": users},
+        {"doctors": schedules},
+        {"appointments": all_appointments, "doctors": doctor_appointments}
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетических данных бота")
+    parser.add_argument("--workdir", default="bench_workdir", help="каталог, в котором будет создан data/")
+    parser.add_argument("--doctors", type=int, default=1000)
+    parser.add_argument("--patients", type=int, default=10000)
+    parser.add_argument("--appointments", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=60, help="записи в пределах ±days от сегодня")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    users, schedules, appointments = generate(args.doctors, args.patients, args.appointments, args.days, args.seed)
+
+    os.makedirs(os.path.join(args.workdir, "data"), exist_ok=True)
+    os.chdir(args.workdir)
+    save_json_data(users, 'users')
+    save_json_data(schedules, 'schedules')
+    save_json_data(appointments, 'appointments')
+
+    print(f"Создано в {os.path.abspath('data')}: врачей {args.doctors}, пациентов {args.patients}, "
+          f"записей {len(appointments['appointments'])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# Бенчмарки хранилища и горячих обработчиков на данных из benchmarks/generate_data.py.
+# Пример: python benchmarks/run.py --workdir /tmp/bench --min-time 2
+# Обработчики с aiogram вызываются напрямую с минимальными объектами callback/state;
+# если aiogram не установлен, эти замеры пропускаются.
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from JSONfunctions import load_json_data, save_json_data, json_transaction
+from user_utils import find_doctors_by_query, get_doctor_days_off
+from appointment_utils import get_doctor_appointments_on_date, get_free_slots, remove_appointments
+
+# Пациент бенчмарка: в сгенерированных данных такого id нет, поэтому его записи легко найти и удалить
+BENCH_PATIENT_ID = 1
+
+class BenchState:
+    """Минимальная замена FSMContext: данные в словаре"""
+
+    def __init__(self, data: dict):
+        self.data = dict(data)
+
+    async def get_data(self) -> dict:
+        return dict(self.data)
+
+    async def update_data(self, **kwargs) -> dict:
+        self.data.update(kwargs)
+        return dict(self.data)
+
+class BenchMessage:
+    async def edit_text(self, text, reply_markup=None):
+        self.text = text
+
+class BenchCallback:
+    """Минимальная замена CallbackQuery: правки сообщения и ответы никуда не отправляются"""
+
+    def __init__(self, user_id: int):
+        self.from_user = SimpleNamespace(id=user_id)
+        self.message = BenchMessage()
+
+    async def answer(self, *args, **kwargs):
+        pass
+
+def measure(func, min_time: float, teardown=None) -> tuple:
+    """Возвращает (операций в секунду, пик памяти одного вызова в байтах).
+    teardown вызывается после каждого вызова func и в замер не входит"""
+    def run_once() -> float:
+        started = time.perf_counter()
+        try:
+            func()
+            return time.perf_counter() - started
+        finally:
+            if teardown:
+                teardown()
+
+    run_once()
+
+    iterations = 0
+    elapsed = 0.0
+    while elapsed < min_time:
+        elapsed += run_once()
+        iterations += 1
+
+    tracemalloc.start()
+    try:
+        run_once()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return iterations / elapsed, peak
+
+def build_cases(rng: random.Random) -> list:
+    """Список замеров: (название, функция без аргументов[, откат после вызова]) или (название, None, причина пропуска)"""
+    appointments = load_json_data('appointments')
+    doctor_ids = list(appointments.get("doctors", {}))
+    sample_appointment = next(iter(appointments.get("appointments", {}).values()))
+    sample_date = date.fromisoformat(sample_appointment["date"])
+    del appointments
+
+    loop = asyncio.new_event_loop()
+
+    def random_doctor() -> int:
+        return int(rng.choice(doctor_ids))
+
+    cases = [
+        ("load_json_data('users')", lambda: load_json_data('users')),
+        ("load_json_data('schedules')", lambda: load_json_data('schedules')),
+        ("load_json_data('appointments')", lambda: load_json_data('appointments')),
+        ("save_json_data('appointments')", lambda: save_json_data(load_json_data('appointments'), 'appointments')),
+        ("find_doctors_by_query", lambda: find_doctors_by_query(rng.choice(["терапевт", "иванов", "ленина", "хирург"]))),
+        ("get_doctor_days_off", lambda: get_doctor_days_off(random_doctor(), sample_date.year, sample_date.month)),
+    ]
+
+    try:
+        from handlers.appointments import save_appointment_data_direct
+        from handlers.calendar import get_booked_time_slots
+        from handlers.my_appointments import show_doctor_appointments_page
+        from keyboards.calendar import CalendarKeyboard
+        from schedule_model import get_compiled_schedule
+    except ImportError as e:
+        for name in ("get_booked_time_slots", "booking", "show_doctor_appointments_page", "CalendarKeyboard.create_calendar"):
+            cases.append((name, None, f"нет зависимости: {e.name}"))
+        return cases
+
+    # Запись на свободный слот через обработчик бота; после каждого вызова запись удаляется,
+    # поэтому слот снова свободен, а данные для следующих замеров не растут
+    booking_doctor, booking_slot = next(
+        ((doctor_id, slots[0])
+         for doctor_id in map(int, doctor_ids)
+         for slots in [get_free_slots(doctor_id, sample_date, "primary")]
+         if slots),
+        (None, None)
+    )
+    booking_patient = {"registration_data": {"fio": "Бенчмарк", "birth_date": "01.01.1990", "phone": "+79000000000"}}
+
+    def book():
+        loop.run_until_complete(save_appointment_data_direct(
+            booking_doctor, sample_date.year, sample_date.month, sample_date.day, booking_slot, "primary",
+            BENCH_PATIENT_ID, booking_patient, BenchCallback(BENCH_PATIENT_ID)
+        ))
+
+    def unbook():
+        with json_transaction('appointments') as appointments_data:
+            remove_appointments(appointments_data, [
+                appointment["appointment_id"]
+                for appointment in get_doctor_appointments_on_date(booking_doctor, sample_date.isoformat(), appointments_data)
+                if appointment["patient_id"] == str(BENCH_PATIENT_ID)
+            ])
+
+    def render_agenda():
+        doctor_id = random_doctor()
+        compiled_schedule = get_compiled_schedule(doctor_id)
+        state = BenchState({
+            "doctor_id": doctor_id,
+            "current_date": sample_date.isoformat(),
+            "schedule_version": compiled_schedule.version if compiled_schedule else 0
+        })
+        loop.run_until_complete(show_doctor_appointments_page(BenchCallback(doctor_id), state))
+
+    def create_calendar():
+        doctor_id = random_doctor()
+        weekends = get_doctor_days_off(doctor_id, sample_date.year, sample_date.month)
+        CalendarKeyboard.create_calendar(sample_date.year, sample_date.month, is_doctor=True,
+                                         weekends=weekends, doctor_id=doctor_id)
+
+    cases += [
+        ("get_booked_time_slots", lambda: get_booked_time_slots(
+            random_doctor(), sample_date.year, sample_date.month, sample_date.day)),
+        ("booking", book, unbook) if booking_doctor else ("booking", None, "нет свободных слотов"),
+        ("show_doctor_appointments_page", render_agenda),
+        ("CalendarKeyboard.create_calendar", create_calendar),
+    ]
+    return cases
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки хранилища и обработчиков")
+    parser.add_argument("--workdir", default="bench_workdir", help="каталог с data/ от generate_data.py")
+    parser.add_argument("--min-time", type=float, default=1.0, help="минимальное время замера (секунд)")
+    parser.add_argument("--only", default="", help="запускать замеры, в названии которых есть эта строка")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    os.chdir(args.workdir)
+    rng = random.Random(args.seed)
+
+    print(f"{'Замер':<36} {'оп/с':>10} {'мс/оп':>10} {'пик памяти, МБ':>16}")
+    for name, func, *extra in build_cases(rng):
+        if args.only and args.only not in name:
+            continue
+        if func is None:
+            print(f"{name:<36} пропущен ({extra[0]})")
+            continue
+
+        ops, peak = measure(func, args.min_time, *extra)
+        print(f"{name:<36} {ops:>10.1f} {1000 / ops:>10.2f} {peak / 1024 / 1024:>16.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,43 @@ class Settings(BaseSettings):
     ADMINS: List[int]
     PG_URL: str
 
+    # Хранилище состояний FSM: файл SQLite и время жизни брошенного сценария (секунд)
+    FSM_DB_PATH: str = "data/fsm.sqlite3"
+    FSM_TTL: int = 86400
+
+    # Режим вебхука включается, если задан WEBHOOK_URL (внешний адрес без пути), иначе - polling
+    WEBHOOK_URL: str = ""
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str = ""
+    WEBAPP_HOST: str = "0.0.0.0"
+    WEBAPP_PORT: int = 8080
+
+    # Сколько апдейтов обрабатывается одновременно (апдейты одного пользователя - всегда по очереди)
+    MAX_CONCURRENT_UPDATES: int = 100
+
+    # Число процессов-обработчиков в режиме вебхука (апдейты распределяются по id пользователя/врача)
+    # и первый из их локальных портов
+    WORKERS: int = 1
+    WORKER_BASE_PORT: int = 8081
+
+    # Ограничение частоты действий пользователя: пополнение токенов в секунду и емкость корзины.
+    # Листание календарей и записей ограничивается отдельно от остальных действий
+    THROTTLE_NAVIGATION_RATE: float = 2.0
+    THROTTLE_NAVIGATION_BURST: int = 5
+    THROTTLE_DEFAULT_RATE: float = 5.0
+    THROTTLE_DEFAULT_BURST: int = 10
+
+    # Повторное нажатие той же кнопки того же сообщения в течение этого окна (секунд) считается дублем
+    IDEMPOTENCY_WINDOW: float = 2.0
+
+    # Адрес /metrics (формат Prometheus) в режиме polling; в режиме вебхука /metrics отдает сам сервер вебхука.
+    # METRICS_PORT = 0 отключает отдельный сервер
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9100
+
+    # Апдейты, прочитавшие и записавшие в файлы данных больше стольких байт, попадают в лог со сводкой
+    IO_LOG_THRESHOLD_BYTES: int = 1048576
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+from typing import Optional
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import Message, InlineKeyboardMarkup
+
+# За это время (секунд) подряд идущие правки одного сообщения схлопываются в одну - с последним состоянием
+EDIT_DEBOUNCE_SECONDS = 0.3
+
+# Отложенные правки: {(chat_id, message_id): (сообщение, текст, клавиатура)}
+pending_edits = {}
+
+# Задачи отложенных правок: {(chat_id, message_id): задача} (ссылки, чтобы задачи не собрал сборщик мусора)
+edit_tasks = {}
+
+def get_edit_key(message: Message) -> tuple:
+    return (message.chat.id, message.message_id)
+
+def render_markup(reply_markup: Optional[InlineKeyboardMarkup]) -> Optional[str]:
+    """Клавиатура в виде строки - для сравнения с уже показанной"""
+    return reply_markup.model_dump_json(exclude_none=True) if reply_markup else None
+
+def schedule_edit(message: Message, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+    """Откладывает правку сообщения; следующая правка в пределах окна заменяет предыдущую"""
+    key = get_edit_key(message)
+    pending_edits[key] = (message, text, reply_markup)
+
+    # Задача сообщения отправляет правки, пока они появляются; новая нужна, только если ее нет
+    if key not in edit_tasks:
+        edit_tasks[key] = asyncio.create_task(flush_edit(key))
+
+async def flush_edit(key: tuple) -> None:
+    """Отправляет последнее состояние сообщения по истечении окна"""
+    try:
+        while key in pending_edits:
+            await asyncio.sleep(EDIT_DEBOUNCE_SECONDS)
+            pending = pending_edits.pop(key, None)
+            if pending:
+                await send_edit(*pending)
+    finally:
+        if edit_tasks.get(key) is asyncio.current_task():
+            del edit_tasks[key]
+
+def cancel_edit(message: Message) -> None:
+    """Отменяет отложенную (в том числе уже отправляемую) правку сообщения - перед тем как править его в обход очереди"""
+    key = get_edit_key(message)
+    pending_edits.pop(key, None)
+
+    task = edit_tasks.get(key)
+    if task is not None and task is not asyncio.current_task():
+        task.cancel()
+        del edit_tasks[key]
+
+async def edit_now(message: Message, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> None:
+    """Правит сообщение сразу, отменяя отложенную правку (чтобы она не перезаписала результат)"""
+    await send_edit(message, text, reply_markup)
+
+async def send_edit(message: Message, text: str, reply_markup: Optional[InlineKeyboardMarkup]) -> None:
+    """Правит сообщение, если его текст или клавиатура действительно изменились"""
+    cancel_edit(message)
+
+    # Сравниваем с тем, что Telegram прислал в самом сообщении: его правят и другие обработчики
+    if (message.text, render_markup(message.reply_markup)) == (text, render_markup(reply_markup)):
+        return
+
+    try:
+        await message.edit_text(text, reply_markup=reply_markup)
+    except TelegramBadRequest as e:
+        if "message is not modified" not in str(e):
+            logging.warning("Ошибка редактирования сообщения %s: %s", get_edit_key(message), e)
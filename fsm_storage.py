@@ -0,0 +1,93 @@
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
+
+# Как часто (секунд) удалять из базы просроченные состояния
+PURGE_INTERVAL_SECONDS = 600
+
+class SQLiteStorage(BaseStorage):
+    """Хранилище FSM в SQLite: состояния переживают перезапуск, брошенные сценарии удаляются по TTL"""
+
+    def __init__(self, path: str, ttl: int):
+        self.ttl = ttl
+        # Все запросы к базе идут по очереди в одном отдельном потоке - цикл событий не блокируется
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fsm-sqlite")
+        # Транзакции открываются явно (BEGIN IMMEDIATE в write)
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fsm ("
+            "key TEXT PRIMARY KEY, state TEXT, data TEXT NOT NULL DEFAULT '{}', expires_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS fsm_expires_at ON fsm (expires_at)")
+        self.last_purge = 0.0
+
+    async def run(self, func, *args, **kwargs):
+        """Выполняет запрос к базе в потоке хранилища"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    @staticmethod
+    def make_key(key: StorageKey) -> str:
+        """Собирает строковый ключ записи из StorageKey"""
+        return ":".join(str(part) for part in (
+            key.bot_id, key.chat_id, key.user_id, key.thread_id,
+            getattr(key, "business_connection_id", None), key.destiny
+        ))
+
+    def read(self, key: StorageKey) -> Optional[tuple]:
+        """Возвращает (state, data) непросроченной записи"""
+        return self.connection.execute(
+            "SELECT state, data FROM fsm WHERE key = ? AND expires_at > ?",
+            (self.make_key(key), time.time())
+        ).fetchone()
+
+    def write(self, key: StorageKey, **fields: Any) -> None:
+        """Обновляет поля записи и продлевает ее срок жизни - одной транзакцией,
+        чтобы параллельные set_state и set_data не затерли поля друг друга (в том числе из другого процесса)"""
+        now = time.time()
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.read(key)
+            state, data = row if row else (None, "{}")
+            state = fields.get("state", state)
+            data = fields.get("data", data)
+
+            if state is None and data == "{}":
+                self.connection.execute("DELETE FROM fsm WHERE key = ?", (self.make_key(key),))
+            else:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO fsm (key, state, data, expires_at) VALUES (?, ?, ?, ?)",
+                    (self.make_key(key), state, data, now + self.ttl)
+                )
+
+            if now - self.last_purge > PURGE_INTERVAL_SECONDS:
+                self.connection.execute("DELETE FROM fsm WHERE expires_at <= ?", (now,))
+                self.last_purge = now
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.run(self.write, key, state=state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        row = await self.run(self.read, key)
+        return row[0] if row else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self.run(self.write, key, data=json.dumps(data, ensure_ascii=False))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        row = await self.run(self.read, key)
+        return json.loads(row[1]) if row else {}
+
+    async def close(self) -> None:
+        await self.run(self.connection.close)
+        self.executor.shutdown()
@@ -0,0 +1,27 @@
+from aiogram import Router, types
+from aiogram.filters import Command, CommandObject
+from config import settings
+from middlewares.profiling import start_profiling
+
+router = Router()
+
+# Ограничение на число апдейтов в одном сеансе профилирования (на время сеанса апдейты идут по одному)
+MAX_PROFILED_UPDATES = 1000
+
+@router.message(Command("profile"))
+async def start_profiling_command(message: types.Message, command: CommandObject):
+    """Включает профилирование следующих N апдейтов (только для администраторов)"""
+    if message.from_user.id not in settings.ADMINS:
+        return
+    
+    updates = command.args.strip() if command.args else "100"
+    if not updates.isdigit() or not 0 < int(updates) <= MAX_PROFILED_UPDATES:
+        await message.answer(f"Использование: /profile N, где N - от 1 до {MAX_PROFILED_UPDATES}")
+        return
+    
+    if not start_profiling(message.chat.id, int(updates)):
+        await message.answer("⏳ Профилирование уже идет, дождитесь отчета")
+        return
+    
+    await message.answer(f"📈 Профилирую следующие {updates} апдейтов (они обрабатываются по одному), "
+                         f"отчет придет файлом")
@@ -3,9 +3,13 @@ from aiogram.fsm.context import FSMContext
 from keyboards.basic import MainMenu as basic
 from handlers.states import States
 from user_utils import is_user_registered, get_user_data
-from JSONfunctions import load_json_data, save_json_data
+from JSONfunctions import json_transaction
 from datetime import datetime
 from handlers.calendar import get_booked_time_slots
+from slot_holds import hold_slot, release_slot, is_held_by_other, HOLD_TTL_SECONDS
+from waitlist import leave_waitlist
+from appointment_utils import get_doctor_appointments_on_date
+from aiogram.utils.keyboard import InlineKeyboardBuilder
 import re
 
 router = Router()
@@ -46,8 +50,17 @@ async def start_appointment_process(callback: types.CallbackQuery, state: FSMCon
     birth_date = reg_data.get("birth_date")
     phone = reg_data.get("phone")
     
-    # Если данные не заполнены, просим заполнить
+    # Если данные не заполнены, закрепляем слот за пациентом и просим заполнить
     if birth_date == "Не указано" or phone == "Не указано":
+        date_str = f"{year}-{month:02d}-{day:02d}"
+        if time_slot in get_booked_time_slots(doctor_id, year, month, day):
+            await callback.answer("❌ Это время уже занято. Пожалуйста, выберите другое время.", show_alert=True)
+            return
+        
+        if not hold_slot(doctor_id, date_str, time_slot, patient_id):
+            await callback.answer("❌ Это время сейчас бронирует другой пациент. Пожалуйста, выберите другое время.", show_alert=True)
+            return
+        
         await state.update_data(
             appointment_doctor_id=doctor_id,
             appointment_year=year,
@@ -72,9 +85,16 @@ async def start_appointment_process(callback: types.CallbackQuery, state: FSMCon
         else:
             text += f"\n📞 Телефон: {phone}"
         
-        text += "\n\nПожалуйста, заполните недостающие данные в личном кабинете."
+        text += f"\n\n⏳ Время {time_slot} закреплено за вами на {HOLD_TTL_SECONDS // 60} минут."
+        text += "\nПожалуйста, заполните недостающие данные в личном кабинете и продолжите запись."
+        
+        # Повторное нажатие проходит тот же путь и сохраняет запись, если данные уже заполнены
+        builder = InlineKeyboardBuilder()
+        builder.add(types.InlineKeyboardButton(text="🔁 Продолжить запись", callback_data=callback.data))
+        builder.add(types.InlineKeyboardButton(text="🏠 На главную", callback_data="exit"))
+        builder.adjust(1)
         
-        await callback.message.edit_text(text, reply_markup=basic.main_menu())
+        await callback.message.edit_text(text, reply_markup=builder.as_markup())
         await callback.answer()
         return
     
@@ -95,9 +115,10 @@ async def save_appointment_data_direct(doctor_id: int, year: int, month: int, da
                                      time_slot: str, appointment_type: str, 
                                      patient_id: int, patient_data: dict, callback: types.CallbackQuery):
     """Сразу сохраняет запись если все данные пациента заполнены"""
-    # Проверяем, не занят ли уже этот слот
+    # Проверяем, не занят ли уже этот слот и не закреплен ли он за другим пациентом
+    date_str = f"{year}-{month:02d}-{day:02d}"
     booked_slots = get_booked_time_slots(doctor_id, year, month, day)
-    if time_slot in booked_slots:
+    if time_slot in booked_slots or is_held_by_other(doctor_id, date_str, time_slot, patient_id):
         await callback.answer("❌ Это время уже занято. Пожалуйста, выберите другое время.", show_alert=True)
         return
     
@@ -118,30 +139,41 @@ async def save_appointment_data_direct(doctor_id: int, year: int, month: int, da
         "created_at": datetime.now().isoformat()
     }
     
-    # Загружаем существующие записи
-    appointments_data = load_json_data('appointments')
-    
-    # Инициализируем структуру если ее нет
-    if "appointments" not in appointments_data:
-        appointments_data["appointments"] = {}
-    
-    if "doctors" not in appointments_data:
-        appointments_data["doctors"] = {}
-    
-    # Сохраняем запись в общий список
-    appointments_data["appointments"][appointment_data["appointment_id"]] = appointment_data
-    
-    # Сохраняем запись в список врача
-    if str(doctor_id) not in appointments_data["doctors"]:
-        appointments_data["doctors"][str(doctor_id)] = {}
-    
-    if "appointments" not in appointments_data["doctors"][str(doctor_id)]:
-        appointments_data["doctors"][str(doctor_id)]["appointments"] = []
+    # Загружаем существующие записи и сохраняем новую под блокировкой файла
+    with json_transaction('appointments') as appointments_data:
+        # Инициализируем структуру если ее нет
+        if "appointments" not in appointments_data:
+            appointments_data["appointments"] = {}
+        
+        if "doctors" not in appointments_data:
+            appointments_data["doctors"] = {}
+        
+        # Слот мог занять другой процесс после проверки выше
+        slot_taken = any(
+            appointment["time_slot"] == time_slot and appointment["status"] != "cancelled"
+            for appointment in get_doctor_appointments_on_date(doctor_id, date_str, appointments_data)
+        )
+        
+        if not slot_taken:
+            # Сохраняем запись в общий список
+            appointments_data["appointments"][appointment_data["appointment_id"]] = appointment_data
+            
+            # Сохраняем запись в список врача
+            if str(doctor_id) not in appointments_data["doctors"]:
+                appointments_data["doctors"][str(doctor_id)] = {}
+            
+            if "appointments" not in appointments_data["doctors"][str(doctor_id)]:
+                appointments_data["doctors"][str(doctor_id)]["appointments"] = []
+            
+            appointments_data["doctors"][str(doctor_id)]["appointments"].append(appointment_data["appointment_id"])
     
-    appointments_data["doctors"][str(doctor_id)]["appointments"].append(appointment_data["appointment_id"])
+    if slot_taken:
+        await callback.answer("❌ Это время уже занято. Пожалуйста, выберите другое время.", show_alert=True)
+        return
     
-    # Сохраняем в JSON
-    save_json_data(appointments_data, 'appointments')
+    # Слот занят записью - временная бронь и ожидание этого дня больше не нужны
+    release_slot(doctor_id, date_str, time_slot, patient_id)
+    leave_waitlist(doctor_id, date_str, patient_id)
     
     # Формируем текст подтверждения
     doctor_data = get_user_data(doctor_id)
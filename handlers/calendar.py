@@ -5,15 +5,31 @@ from keyboards.calendar import CalendarKeyboard
 from keyboards.weekend_selection import WeekendSelectionKeyboard
 from handlers.states import States
 from user_utils import *
-from datetime import datetime
+from datetime import datetime, date
 from aiogram.types import InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from JSONfunctions import load_json_data
-from config import settings
+from JSONfunctions import load_json_data, json_transaction
+from schedule_model import get_compiled_schedule
+from appointment_utils import get_doctor_appointments, build_doctor_day_index, remove_appointments, plan_day_move
+from bisect import bisect_left
+from weekend_rules import copy_rules, is_day_off, toggle_date, toggle_weekday, days_off_in_month
+from notifications import enqueue_notifications
+from slot_holds import get_held_slots
+from waitlist import join_waitlist, build_slot_released_messages
+from edit_coalescer import schedule_edit, edit_now
 
 router = Router()
 temp_weekends_storage = {}
 
+# Сколько ближайших дней предлагать для переноса записей
+MOVE_TARGET_DAYS = 10
+
+WEEKEND_SELECTION_TEXT = (
+    "📅 Выбор выходных дней\nНажимайте на даты, чтобы отметить их как выходные\n"
+    "Нажмите на день недели, чтобы сделать выходным каждый такой день\n"
+    "Затем нажмите 'Подтвердить ✅' - записи на выбранные дни будут отменены"
+)
+
 @router.callback_query(F.data == 'appointment_calendar')
 async def show_calendar(callback: types.CallbackQuery):
     """Показывает календарь для записи на прием"""
@@ -29,7 +45,7 @@ async def show_calendar(callback: types.CallbackQuery):
         user_data = get_user_data(user_id)
         if user_data["registration_data"]["role"] == "doctor":
             is_doctor = True
-            weekends = get_doctor_weekends(user_id)
+            weekends = get_doctor_days_off(user_id, year, month)
     
     markup = CalendarKeyboard.create_calendar(year, month, is_doctor=is_doctor, weekends=weekends)
     
@@ -61,7 +77,7 @@ async def navigate_calendar(callback: types.CallbackQuery):
         user_data = get_user_data(user_id)
         if user_data["registration_data"]["role"] == "doctor":
             is_doctor = True
-            weekends = get_doctor_weekends(user_id)
+            weekends = get_doctor_days_off(user_id, year, month)
     
     markup = CalendarKeyboard.create_calendar(year, month, is_doctor=is_doctor, weekends=weekends)
     
@@ -91,16 +107,15 @@ async def start_weekend_selection(callback: types.CallbackQuery):
     year = today.year
     month = today.month
     
-    # Загружаем текущие выходные врача и сохраняем во временное хранилище
-    weekends = get_doctor_weekends(user_id)
-    temp_weekends_storage[user_id] = weekends.copy()
+    # Загружаем текущие правила выходных врача и сохраняем копию во временное хранилище
+    rules = get_doctor_weekend_rules(user_id)
+    temp_weekends_storage[user_id] = copy_rules(rules)
     
-    markup = WeekendSelectionKeyboard.create_calendar(year, month, weekends)
-    
-    await callback.message.edit_text(
-        "📅 Выбор выходных дней\nНажимайте на даты, чтобы отметить их как выходные\nЗатем нажмите 'Подтвердить ✅'",
-        reply_markup=markup
+    markup = WeekendSelectionKeyboard.create_calendar(
+        year, month, days_off_in_month(rules, year, month), rules["weekday_mask"]
     )
+    
+    await callback.message.edit_text(WEEKEND_SELECTION_TEXT, reply_markup=markup)
     await callback.answer()
 
 @router.callback_query(F.data.startswith('weekend_select_'))
@@ -126,42 +141,45 @@ async def select_weekend_day(callback: types.CallbackQuery):
     day = int(parts[4])
     
     selected_date = datetime(year, month, day).date()
-    date_str = selected_date.isoformat()
     
-    # Получаем текущие выбранные даты из временного хранилища
-    if user_id not in temp_weekends_storage:
-        temp_weekends_storage[user_id] = set()
+    # Получаем текущие правила из временного хранилища
+    rules = get_temp_weekend_rules(user_id)
     
-    weekends = temp_weekends_storage[user_id]
+    # Переключаем выходной для даты (для дня по правилу - как исключение).
+    # Записи отменяются только при подтверждении, поэтому повторное нажатие ничего не стоит
+    toggle_date(rules, selected_date)
     
-    # Проверяем, добавляем или убираем выходной
-    was_weekend = date_str in weekends
+    # Обновляем календарь: частые нажатия схлопываются в одну правку с последним состоянием
+    markup = WeekendSelectionKeyboard.create_calendar(
+        year, month, days_off_in_month(rules, year, month), rules["weekday_mask"]
+    )
     
-    if was_weekend:
-        # Убираем выходной
-        weekends.remove(date_str)
-        action = "removed"
-    else:
-        # Добавляем выходной - проверяем есть ли записи на этот день
-        appointments_on_date = get_appointments_on_date(user_id, year, month, day)
-        if appointments_on_date:
-            # Есть записи - отправляем уведомления и удаляем записи
-            await notify_patients_about_cancellation(appointments_on_date, selected_date, settings.BOT_TOKEN)
-            delete_appointments_on_date(appointments_on_date)
-        
-        weekends.add(date_str)
-        action = "added"
+    schedule_edit(callback.message, WEEKEND_SELECTION_TEXT, markup)
+    await callback.answer()
+
+@router.callback_query(F.data.startswith('weekend_rule_'))
+async def toggle_weekend_weekday(callback: types.CallbackQuery):
+    """Включает/выключает выходной на каждый выбранный день недели"""
+    user_id = callback.from_user.id
+    parts = callback.data.split('_')
     
-    # Обновляем временное хранилище
-    temp_weekends_storage[user_id] = weekends
+    if len(parts) != 5:
+        await callback.answer("Ошибка выбора дня недели")
+        return
     
-    # Обновляем календарь
-    markup = WeekendSelectionKeyboard.create_calendar(year, month, weekends)
-  
-    await callback.message.edit_text(
-        "📅 Выбор выходных дней\nНажимайте на даты, чтобы отметить их как выходные\nЗатем нажмите 'Подтвердить ✅'",
-        reply_markup=markup
+    weekday = int(parts[2])
+    year = int(parts[3])
+    month = int(parts[4])
+    
+    rules = get_temp_weekend_rules(user_id)
+    toggle_weekday(rules, weekday)
+    
+    markup = WeekendSelectionKeyboard.create_calendar(
+        year, month, days_off_in_month(rules, year, month), rules["weekday_mask"]
     )
+    
+    schedule_edit(callback.message, WEEKEND_SELECTION_TEXT, markup)
+    await callback.answer()
 
 @router.callback_query(F.data.startswith('weekend_nav_'))
 async def navigate_weekend_calendar(callback: types.CallbackQuery):
@@ -177,18 +195,14 @@ async def navigate_weekend_calendar(callback: types.CallbackQuery):
     year = int(parts[2])
     month = int(parts[3])
     
-    # Получаем текущие выбранные даты из временного хранилища
-    if user_id not in temp_weekends_storage:
-        temp_weekends_storage[user_id] = set()
-    
-    weekends = temp_weekends_storage[user_id]
-    
-    markup = WeekendSelectionKeyboard.create_calendar(year, month, weekends)
+    # Получаем текущие правила из временного хранилища
+    rules = get_temp_weekend_rules(user_id)
     
-    await callback.message.edit_text(
-        "📅 Выбор выходных дней\nНажимайте на даты, чтобы отметить их как выходные\nЗатем нажмите 'Подтвердить ✅'",
-        reply_markup=markup
+    markup = WeekendSelectionKeyboard.create_calendar(
+        year, month, days_off_in_month(rules, year, month), rules["weekday_mask"]
     )
+    
+    schedule_edit(callback.message, WEEKEND_SELECTION_TEXT, markup)
     await callback.answer()
 
 @router.callback_query(F.data == 'weekend_confirm')
@@ -196,34 +210,52 @@ async def confirm_weekends(callback: types.CallbackQuery):
     """Подтверждает выбор выходных дней и сохраняет их в JSON"""
     user_id = callback.from_user.id
     
-    # Получаем выбранные даты из временного хранилища
+    # Получаем выбранные правила из временного хранилища
     if user_id not in temp_weekends_storage:
         await callback.answer("❌ Не выбрано ни одного дня!", show_alert=True)
         return
     
-    weekends = temp_weekends_storage[user_id]
+    rules = temp_weekends_storage[user_id]
+    
+    # Одной транзакцией отменяем все будущие записи, попавшие на выходные
+    cancelled = cancel_appointments_on_days_off(user_id, rules)
     
     # Сохраняем в JSON
-    save_doctor_weekends(user_id, weekends)
+    save_doctor_weekends(user_id, rules)
     
     # Очищаем временное хранилище
     if user_id in temp_weekends_storage:
         del temp_weekends_storage[user_id]
     
-    await callback.answer(f"✅ Сохранено выходных дней: {len(weekends)}", show_alert=True)
+    # Уведомления пациентам - одной фоновой пачкой
+    notify_patients_about_cancellation(callback.bot, cancelled)
+    
+    text = "✅ Выходные дни сохранены"
+    if cancelled:
+        text += f"\nОтменено записей: {len(cancelled)}"
+    await callback.answer(text, show_alert=True)
     
     # Возвращаемся к обычному календарю
     today = datetime.now()
     year = today.year
     month = today.month
     
+    weekends = days_off_in_month(rules, year, month)
     markup = CalendarKeyboard.create_calendar(year, month, is_doctor=True, weekends=weekends)
     
-    await callback.message.edit_text(
+    # Сразу и с отменой отложенной правки календаря выходных, чтобы она не перезаписала результат
+    await edit_now(
+        callback.message,
         f"📅 Запись на прием\n✅ - выходные дни\n{CalendarKeyboard.MONTHS_RU[month-1]} {year}",
-        reply_markup=markup
+        markup
     )
 
+def get_temp_weekend_rules(user_id: int) -> dict:
+    """Возвращает редактируемые правила выходных врача (при отсутствии - копию сохраненных)"""
+    if user_id not in temp_weekends_storage:
+        temp_weekends_storage[user_id] = copy_rules(get_doctor_weekend_rules(user_id))
+    return temp_weekends_storage[user_id]
+
 @router.callback_query(F.data.startswith('calendar_nav_'))
 async def navigate_calendar(callback: types.CallbackQuery):
     """Обрабатывает навигацию по личному календарю"""
@@ -245,7 +277,7 @@ async def navigate_calendar(callback: types.CallbackQuery):
         user_data = get_user_data(user_id)
         if user_data["registration_data"]["role"] == "doctor":
             is_doctor = True
-            weekends = get_doctor_weekends(user_id)
+            weekends = get_doctor_days_off(user_id, year, month)
     
     markup = CalendarKeyboard.create_calendar(year, month, is_doctor=is_doctor, weekends=weekends)
     
@@ -328,12 +360,138 @@ async def show_doctor_day_appointments(callback: types.CallbackQuery, doctor_id:
     
     # Создаем клавиатуру
     builder = InlineKeyboardBuilder()
+    if any(appointment["status"] != "cancelled" for appointment in day_appointments):
+        builder.add(InlineKeyboardButton(
+            text="🔁 Перенести записи на другой день",
+            callback_data=f"move_day_{year}_{month}_{day}"
+        ))
     builder.add(InlineKeyboardButton(text="🏠 На главную", callback_data="exit"))
     builder.adjust(1)
     
     await callback.message.edit_text(text, reply_markup=builder.as_markup())
     await callback.answer()
 
+@router.callback_query(F.data.startswith('move_day_'))
+async def choose_move_target_day(callback: types.CallbackQuery):
+    """Показывает ближайшие рабочие дни, на которые можно перенести все записи дня"""
+    parts = callback.data.split('_')
+    
+    if len(parts) != 5:
+        await callback.answer("Ошибка выбора даты")
+        return
+    
+    doctor_id = callback.from_user.id
+    source_date = date(int(parts[2]), int(parts[3]), int(parts[4]))
+    
+    day_index = build_doctor_day_index(doctor_id)
+    source_appointments = get_active_appointments(day_index, source_date)
+    
+    if not source_appointments:
+        await callback.answer("❌ На этот день нет записей для переноса", show_alert=True)
+        return
+    
+    # Ищем ближайшие рабочие дни, где хватает свободных слотов каждого типа
+    today = datetime.now().date()
+    working_days = get_doctor_working_days(doctor_id)
+    builder = InlineKeyboardBuilder()
+    targets_found = 0
+    
+    for target_date in working_days[bisect_left(working_days, today):]:
+        if target_date == source_date:
+            continue
+        
+        plan = plan_day_move(doctor_id, source_appointments, target_date, day_index)
+        if plan is None:
+            continue
+        
+        month_name = CalendarKeyboard.MONTHS_RU[target_date.month - 1]
+        builder.add(InlineKeyboardButton(
+            text=f"{target_date.day} {month_name} {target_date.year}",
+            callback_data=f"move_to_{source_date:%Y%m%d}_{target_date:%Y%m%d}"
+        ))
+        
+        targets_found += 1
+        if targets_found == MOVE_TARGET_DAYS:
+            break
+    
+    builder.add(InlineKeyboardButton(text="🏠 На главную", callback_data="exit"))
+    builder.adjust(1)
+    
+    month_name = CalendarKeyboard.MONTHS_RU[source_date.month - 1]
+    text = f"🔁 Перенос записей с {source_date.day} {month_name} {source_date.year}\n"
+    text += f"Записей: {len(source_appointments)}\n\n"
+    text += "Выберите день для переноса:" if targets_found else "❌ Нет дней с достаточным количеством свободных слотов."
+    
+    await callback.message.edit_text(text, reply_markup=builder.as_markup())
+    await callback.answer()
+
+@router.callback_query(F.data.startswith('move_to_'))
+async def move_day_appointments(callback: types.CallbackQuery):
+    """Переносит все записи дня на выбранный день одной записью файла"""
+    parts = callback.data.split('_')
+    
+    if len(parts) != 4:
+        await callback.answer("Ошибка выбора даты")
+        return
+    
+    doctor_id = callback.from_user.id
+    source_date = datetime.strptime(parts[2], "%Y%m%d").date()
+    target_date = datetime.strptime(parts[3], "%Y%m%d").date()
+    
+    # Записи в индексе - те же объекты, что и в загруженных данных, поэтому правим их на месте
+    messages = []
+    released = []
+    with json_transaction('appointments') as appointments_data:
+        day_index = build_doctor_day_index(doctor_id, appointments_data)
+        source_appointments = get_active_appointments(day_index, source_date)
+        
+        # Переносим все записи или ни одной
+        plan = plan_day_move(doctor_id, source_appointments, target_date, day_index) if source_appointments else None
+        
+        for appointment, new_slot in plan or []:
+            old_text = f"{format_short_date(source_date)} {appointment['time_slot']}"
+            new_text = f"{format_short_date(target_date)} {new_slot}"
+            # Слот исходного дня освобождается - запоминаем его до изменения записи
+            released.append(dict(appointment))
+            
+            appointment["date"] = target_date.isoformat()
+            appointment["time_slot"] = new_slot
+            
+            messages.append((
+                int(appointment["patient_id"]),
+                f"🔁 Ваша запись перенесена врачом с {old_text} на {new_text}"
+            ))
+    
+    if not source_appointments:
+        await callback.answer("❌ На этот день нет записей для переноса", show_alert=True)
+        return
+    
+    if plan is None:
+        await callback.answer("❌ На выбранный день уже не хватает свободных слотов", show_alert=True)
+        return
+    
+    # Уведомления пациентам и листу ожидания исходного дня - одной фоновой пачкой
+    messages.extend(build_slot_released_messages(released))
+    enqueue_notifications(callback.bot, messages)
+    
+    await callback.message.edit_text(
+        f"✅ Перенесено записей: {len(plan)}\n{format_short_date(source_date)} → {format_short_date(target_date)}",
+        reply_markup=basic.main_menu()
+    )
+    await callback.answer()
+
+def get_active_appointments(day_index: dict, day: date) -> list:
+    """Возвращает неотмененные записи дня из индекса записей врача"""
+    return [
+        appointment
+        for appointment in day_index.get(day.isoformat(), [])
+        if appointment["status"] != "cancelled"
+    ]
+
+def format_short_date(day: date) -> str:
+    """Форматирует дату как '5 Март 2025'"""
+    return f"{day.day} {CalendarKeyboard.MONTHS_RU[day.month - 1]} {day.year}"
+
 async def show_appointment_type_selection(callback: types.CallbackQuery, user_id: int, year: int, month: int, day: int):
     """Показывает выбор типа приема (старая логика для пациентов)"""
     # Определяем doctor_id (для личного календаря - текущий пользователь)
@@ -410,35 +568,41 @@ async def show_time_slots(callback: types.CallbackQuery, appointment_type: str):
         await callback.answer("❌ Врач не найден!", show_alert=True)
         return
     
-    # Получаем расписание врача
-    schedule = get_doctor_schedule(doctor_id)
-    if not schedule:
+    # Получаем скомпилированное расписание врача
+    compiled_schedule = get_compiled_schedule(doctor_id)
+    if not compiled_schedule:
         await callback.answer("❌ У врача не настроено расписание!", show_alert=True)
         return
     
-    # Определяем временной диапазон в зависимости от типа приема
-    if appointment_type == "primary":
-        start_time = schedule.get("primary_start")
-        end_time = schedule.get("primary_end")
-        type_text = "Первичный"
-    else:
-        start_time = schedule.get("repeat_start")
-        end_time = schedule.get("repeat_end")
-        type_text = "Вторичный"
+    type_text = "Первичный" if appointment_type == "primary" else "Вторичный"
+    
+    # Слоты нужного типа приема на эту дату (с учетом дня недели и исключений)
+    time_slots = [slot[2] for slot in compiled_schedule.slots_for(date(year, month, day), appointment_type)]
     
-    if not start_time or not end_time:
+    if not time_slots:
         await callback.answer("❌ В расписании врача не указано время для данного типа приема!", show_alert=True)
         return
     
-    # Получаем занятые временные слоты на эту дату
+    # Получаем занятые и временно закрепленные за другими пациентами слоты и фильтруем их
     booked_slots = get_booked_time_slots(doctor_id, year, month, day)
-    
-    # Генерируем временные интервалы и фильтруем занятые
-    time_slots = generate_time_slots(start_time, end_time, schedule["patient_time"])
-    available_slots = [slot for slot in time_slots if slot not in booked_slots]
+    held_slots = get_held_slots(doctor_id, f"{year}-{month:02d}-{day:02d}", callback.from_user.id)
+    available_slots = [slot for slot in time_slots if slot not in booked_slots and slot not in held_slots]
     
     if not available_slots:
-        await callback.answer("❌ На этот день нет свободных временных слотов!", show_alert=True)
+        # Свободных слотов нет - предлагаем встать в лист ожидания вместо повторных проверок
+        builder = InlineKeyboardBuilder()
+        builder.add(InlineKeyboardButton(
+            text="🔔 Сообщить, когда освободится",
+            callback_data=f"waitlist_join_{doctor_id}_{year}_{month}_{day}"
+        ))
+        builder.add(InlineKeyboardButton(text="🏠 На главную", callback_data="exit"))
+        builder.adjust(1)
+        
+        await callback.message.edit_text(
+            f"❌ На {day} {CalendarKeyboard.MONTHS_RU[month-1]} {year} нет свободных временных слотов.",
+            reply_markup=builder.as_markup()
+        )
+        await callback.answer()
         return
     
     reg_data = doctor_data["registration_data"]
@@ -447,7 +611,7 @@ async def show_time_slots(callback: types.CallbackQuery, appointment_type: str):
     
     text = f"Запись на {day} {month_name} {year}.\n{type_text} прием к врачу {doctor_name}"
     
-    if booked_slots:
+    if booked_slots or held_slots:
         text += f"\n\n✅ Свободные слоты ({len(available_slots)} из {len(time_slots)})"
     else:
         text += f"\n\n✅ Доступные слоты: {len(available_slots)}"
@@ -469,6 +633,23 @@ async def show_time_slots(callback: types.CallbackQuery, appointment_type: str):
     await callback.message.edit_text(text, reply_markup=builder.as_markup())
     await callback.answer()
 
+@router.callback_query(F.data.startswith('waitlist_join_'))
+async def join_day_waitlist(callback: types.CallbackQuery):
+    """Добавляет пациента в лист ожидания дня врача"""
+    parts = callback.data.split('_')
+    
+    if len(parts) != 6:
+        await callback.answer("Ошибка выбора даты")
+        return
+    
+    doctor_id = int(parts[2])
+    date_str = f"{int(parts[3])}-{int(parts[4]):02d}-{int(parts[5]):02d}"
+    
+    if join_waitlist(doctor_id, date_str, callback.from_user.id):
+        await callback.answer("🔔 Мы сообщим, как только освободится время на этот день", show_alert=True)
+    else:
+        await callback.answer("Вы уже в листе ожидания на этот день", show_alert=True)
+
 def get_booked_time_slots(doctor_id: int, year: int, month: int, day: int) -> list:
     """Возвращает список занятых временных слотов на указанную дату"""
     appointments_data = load_json_data('appointments')
@@ -487,85 +668,30 @@ def get_booked_time_slots(doctor_id: int, year: int, month: int, day: int) -> li
     
     return booked_slots
 
-def generate_time_slots(start_time: str, end_time: str, patient_time: int) -> list:
-    """Генерирует список временных интервалов в формате ЧЧ:00-ЧЧ:30"""
-    slots = []
-    start_h, start_m = map(int, start_time.split(':'))
-    end_h, end_m = map(int, end_time.split(':'))
-    
-    start_total = start_h * 60 + start_m
-    end_total = end_h * 60 + end_m
-    
-    current = start_total
-    while current + patient_time <= end_total:
-        # Форматируем начало и конец интервала
-        start_slot = f"{current//60:02d}:{(current%60):02d}"
-        end_slot = f"{(current+patient_time)//60:02d}:{((current+patient_time)%60):02d}"
-        slots.append(f"{start_slot}-{end_slot}")
-        current += patient_time
-    
-    return slots
-
-def get_appointments_on_date(doctor_id: int, year: int, month: int, day: int) -> list:
-    """Возвращает все записи врача на указанную дату"""
-    appointments_data = load_json_data('appointments')
-    
-    target_date = f"{year}-{month:02d}-{day:02d}"
-    appointments_on_date = []
-    
-    for appointment_id, appointment in appointments_data.get("appointments", {}).items():
-        if (appointment["doctor_id"] == str(doctor_id) and 
-            appointment["date"] == target_date and
-            appointment["status"] != "cancelled"):
-            appointments_on_date.append(appointment)
-    
-    return appointments_on_date
-
-async def notify_patients_about_cancellation(appointments: list, date: datetime.date, bot_token: str):
-    """Отправляет уведомления пациентам об отмене записей"""
-    from aiogram import Bot
-    
-    # Создаем экземпляр бота с токеном
-    bot = Bot(token=bot_token)
-    
-    month_name = CalendarKeyboard.MONTHS_RU[date.month - 1]
-    date_text = f"{date.day} {month_name} {date.year}"
+def cancel_appointments_on_days_off(doctor_id: int, rules: dict) -> list:
+    """Удаляет будущие записи врача, попавшие на выходные, с одной записью файла"""
+    today = datetime.now().date()
     
-    for appointment in appointments:
-        try:
-            patient_id = int(appointment["patient_id"])
-            message_text = f"❌ Ваша запись на {date_text} была отменена, пожалуйста, запишитесь на другое время"
-            
-            await bot.send_message(
-                chat_id=patient_id,
-                text=message_text
-            )
-            print(f"✅ Уведомление отправлено пациенту {appointment['patient_id']}")
-        except Exception as e:
-            print(f"❌ Ошибка отправки уведомления пациенту {appointment['patient_id']}: {e}")
-    
-    # Закрываем сессию бота
-    await bot.session.close()
+    with json_transaction('appointments') as appointments_data:
+        appointment_ids = [
+            appointment["appointment_id"]
+            for appointment in get_doctor_appointments(doctor_id, appointments_data)
+            if appointment["status"] != "cancelled"
+            and date.fromisoformat(appointment["date"]) >= today
+            and is_day_off(rules, date.fromisoformat(appointment["date"]))
+        ]
+        return remove_appointments(appointments_data, appointment_ids)
 
-def delete_appointments_on_date(appointments: list):
-    """Удаляет записи на указанную дату"""
-    appointments_data = load_json_data('appointments')
+def notify_patients_about_cancellation(bot, appointments: list):
+    """Ставит в очередь уведомления пациентам об отмене записей"""
+    messages = []
+    for appointment in sorted(appointments, key=lambda x: (x["date"], x["time_slot"])):
+        appointment_date = date.fromisoformat(appointment["date"])
+        month_name = CalendarKeyboard.MONTHS_RU[appointment_date.month - 1]
+        date_text = f"{appointment_date.day} {month_name} {appointment_date.year}"
+        messages.append((
+            int(appointment["patient_id"]),
+            f"❌ Ваша запись на {date_text} была отменена, пожалуйста, запишитесь на другое время"
+        ))
     
-    for appointment in appointments:
-        appointment_id = appointment["appointment_id"]
-        doctor_id = appointment["doctor_id"]
-        
-        # Удаляем запись из общего списка
-        if appointment_id in appointments_data.get("appointments", {}):
-            del appointments_data["appointments"][appointment_id]
-        
-        # Удаляем запись из списка врача
-        if (doctor_id in appointments_data.get("doctors", {}) and 
-            "appointments" in appointments_data["doctors"][doctor_id]):
-            appointments_data["doctors"][doctor_id]["appointments"] = [
-                app_id for app_id in appointments_data["doctors"][doctor_id]["appointments"]
-                if app_id != appointment_id
-            ]
-    
-    # Сохраняем изменения
-    save_json_data(appointments_data, 'appointments')
\ No newline at end of file
+    enqueue_notifications(bot, messages)
\ No newline at end of file
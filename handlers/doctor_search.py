@@ -3,7 +3,8 @@ from aiogram.fsm.context import FSMContext
 from keyboards.basic import MainMenu as basic
 from keyboards.calendar import CalendarKeyboard
 from handlers.states import States
-from user_utils import is_user_registered, get_user_data, get_doctor_weekends, find_doctors_by_query, get_short_name
+from user_utils import is_user_registered, get_user_data, get_doctor_days_off, find_doctors_by_query, get_short_name
+from view_cache import get_cached_view, store_view
 from datetime import datetime
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -54,15 +55,7 @@ async def process_find_doctor_query(message: types.Message, state: FSMContext):
     results_text = f"🔎 Найдено врачей: {len(found_doctors)}\n\n"
     
     for i, doctor_data in enumerate(found_doctors, 1):
-        reg_data = doctor_data["registration_data"]
-        results_text += f"{i}. 👨‍⚕️ {reg_data['fio']}\n"
-        results_text += f"   🏥 {reg_data['specialty']}\n"
-        results_text += f"   🏢 {reg_data['office_address']}\n"
-        
-        if reg_data.get('website_link') and reg_data['website_link'] != "Не указано":
-            results_text += f"   🌐 {reg_data['website_link']}\n"
-        
-        results_text += "\n"
+        results_text += f"{i}. {get_doctor_card_text(doctor_data)}\n"
     
     # Создаем клавиатуру с кнопками для каждого врача
     builder = InlineKeyboardBuilder()
@@ -91,6 +84,23 @@ async def process_find_doctor_query(message: types.Message, state: FSMContext):
     await message.answer(results_text, reply_markup=builder.as_markup())
     await state.set_state(States.find_doctor_query)
 
+def get_doctor_card_text(doctor_data: dict) -> str:
+    """Возвращает карточку врача для результатов поиска (готовую, если запись врача не менялась)"""
+    version = doctor_data.get("version", 0)
+    card_text = get_cached_view("doctor_card", doctor_data["user_id"], version)
+    if card_text is not None:
+        return card_text
+    
+    reg_data = doctor_data["registration_data"]
+    card_text = f"👨‍⚕️ {reg_data['fio']}\n"
+    card_text += f"   🏥 {reg_data['specialty']}\n"
+    card_text += f"   🏢 {reg_data['office_address']}\n"
+    
+    if reg_data.get('website_link') and reg_data['website_link'] != "Не указано":
+        card_text += f"   🌐 {reg_data['website_link']}\n"
+    
+    return store_view("doctor_card", doctor_data["user_id"], version, card_text)
+
 @router.callback_query(F.data.startswith('doctor_calendar_') & ~F.data.contains('nav'))
 async def show_doctor_calendar(callback: types.CallbackQuery):
     """Показывает календарь выбранного врача (только при прямом вызове, не навигация)"""
@@ -114,7 +124,7 @@ async def show_doctor_calendar(callback: types.CallbackQuery):
     month = today.month
     
     # Получаем выходные ВРАЧА
-    weekends = get_doctor_weekends(doctor_user_id)
+    weekends = get_doctor_days_off(doctor_user_id, year, month)
     
     # Создаем календарь врача (is_doctor=False, но передаем doctor_id)
     markup = CalendarKeyboard.create_calendar(
@@ -154,7 +164,7 @@ async def navigate_doctor_calendar(callback: types.CallbackQuery):
         return
     
     # Получаем выходные врача
-    weekends = get_doctor_weekends(doctor_id)
+    weekends = get_doctor_days_off(doctor_id, year, month)
     
     # Создаем календарь врача
     markup = CalendarKeyboard.create_calendar(
@@ -1,17 +1,35 @@
 from aiogram import Router, types, F
 from aiogram.fsm.context import FSMContext
 from keyboards.basic import MainMenu as basic
-from user_utils import is_user_registered, get_user_data, get_month_name, get_doctor_weekends
-from JSONfunctions import load_json_data, save_json_data
+from user_utils import is_user_registered, get_user_data, get_users_data, get_month_name, get_doctor_working_days
+from schedule_model import get_compiled_schedule, format_minutes
+from waitlist import publish_slot_released, build_slot_released_messages
+from notifications import enqueue_notifications
+from appointment_utils import build_doctor_day_index, get_doctor_appointments_in_range, map_appointments_by_start, remove_appointments
+from JSONfunctions import load_json_data, json_transaction
 from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 import json
 
 router = Router()
 
 # Глобальный словарь для хранения данных пагинации (временное решение)
+# {doctor_id: {"key": (начало, дней, версия расписания), "pages": [тексты страниц]}} - готовые страницы просмотра за период
 doctor_appointments_data = {}
 
+# Максимальная длина одной страницы просмотра за период (лимит Telegram - 4096 символов)
+RANGE_PAGE_LENGTH = 3500
+
+# Доступные периоды просмотра записей врача (дней)
+RANGE_DAYS_OPTIONS = (7, 14)
+
+# Сколько неподтвержденных записей показывать на одной странице пакетного подтверждения
+PENDING_PAGE_SIZE = 20
+
+# Количество записей пациента на одной странице
+PATIENT_PAGE_SIZE = 5
+
 @router.callback_query(F.data == 'my_appointments')
 async def show_my_appointments(callback: types.CallbackQuery, state: FSMContext):
     """Показывает записи пользователя (для пациента) или врача"""
@@ -25,12 +43,13 @@ async def show_my_appointments(callback: types.CallbackQuery, state: FSMContext)
     role = user_data["registration_data"]["role"]
     
     if role == "patient":
-        await show_patient_appointments(callback, user_id)
+        await show_patient_appointments(callback, user_id, state)
+        await callback.answer()
     else:
         await show_doctor_appointments(callback, user_id, state)
 
-async def show_patient_appointments(callback: types.CallbackQuery, patient_id: int):
-    """Показывает все записи пациента с возможностью удаления"""
+async def show_patient_appointments(callback: types.CallbackQuery, patient_id: int, state: FSMContext, page: int = 0):
+    """Показывает записи пациента одним сообщением с постраничной навигацией"""
     appointments_data = load_json_data('appointments')
     
     # Находим все записи пациента
@@ -44,35 +63,80 @@ async def show_patient_appointments(callback: types.CallbackQuery, patient_id: i
             "📋 У вас пока нет записей на прием.",
             reply_markup=basic.main_menu()
         )
-        await callback.answer()
         return
     
     # Сортируем записи по дате (сначала ближайшие)
-    patient_appointments.sort(key=lambda x: x['date'])
+    patient_appointments.sort(key=lambda x: (x['date'], x['time_slot']))
     
-    # Отправляем каждую запись отдельным сообщением с кнопкой удаления
-    for appointment in patient_appointments:
-        appointment_text = format_appointment_text(appointment)
-        
-        # Создаем клавиатуру с кнопкой удаления
-        builder = InlineKeyboardBuilder()
-        builder.add(types.InlineKeyboardButton(
-            text="❌ Удалить запись",
+    # Ограничиваем номер страницы (после удаления страниц может стать меньше)
+    total_pages = (len(patient_appointments) + PATIENT_PAGE_SIZE - 1) // PATIENT_PAGE_SIZE
+    page = max(0, min(page, total_pages - 1))
+    await state.update_data(patient_appointments_page=page)
+    
+    first_index = page * PATIENT_PAGE_SIZE
+    page_appointments = patient_appointments[first_index:first_index + PATIENT_PAGE_SIZE]
+    
+    # Данные врачей всей страницы - одним чтением users.json
+    doctors = get_users_data({appointment["doctor_id"] for appointment in page_appointments})
+    
+    # Формируем текст страницы
+    page_text = f"📋 Ваши записи: {len(patient_appointments)}\n\n"
+    for number, appointment in enumerate(page_appointments, first_index + 1):
+        doctor_data = doctors.get(appointment["doctor_id"])
+        page_text += format_appointment_short_text(appointment, number, doctor_data) + "\n"
+    
+    # Кнопки удаления для каждой записи на странице
+    builder = InlineKeyboardBuilder()
+    for number, appointment in enumerate(page_appointments, first_index + 1):
+        builder.row(types.InlineKeyboardButton(
+            text=f"❌ Удалить запись №{number}",
             callback_data=f"delete_appointment_{appointment['appointment_id']}"
         ))
-        builder.adjust(1)
-        
-        await callback.message.answer(appointment_text, reply_markup=builder.as_markup())
     
-    await callback.answer(f"📋 Найдено записей: {len(patient_appointments)}")
+    # Навигация по страницам
+    if total_pages > 1:
+        nav_buttons = []
+        if page > 0:
+            nav_buttons.append(types.InlineKeyboardButton(
+                text="◀️",
+                callback_data=f"patient_appointments_page_{page - 1}"
+            ))
+        nav_buttons.append(types.InlineKeyboardButton(
+            text=f"{page + 1}/{total_pages}",
+            callback_data="ignore"
+        ))
+        if page < total_pages - 1:
+            nav_buttons.append(types.InlineKeyboardButton(
+                text="▶️",
+                callback_data=f"patient_appointments_page_{page + 1}"
+            ))
+        builder.row(*nav_buttons)
+    
+    builder.row(types.InlineKeyboardButton(
+        text="🏠 На главную",
+        callback_data="exit"
+    ))
+    
+    await callback.message.edit_text(page_text, reply_markup=builder.as_markup())
+
+@router.callback_query(F.data.startswith('patient_appointments_page_'))
+async def patient_appointments_page(callback: types.CallbackQuery, state: FSMContext):
+    """Переключает страницу в списке записей пациента"""
+    page = callback.data.removeprefix('patient_appointments_page_')
+    
+    if not page.isdigit():
+        await callback.answer("Ошибка навигации")
+        return
+    
+    await show_patient_appointments(callback, callback.from_user.id, state, int(page))
+    await callback.answer()
 
 async def show_doctor_appointments(callback: types.CallbackQuery, doctor_id: int, state: FSMContext):
     """Показывает все записи врача с пагинацией по дням"""
-    # Получаем расписание врача
-    schedules_data = load_json_data('schedules')
-    schedule = schedules_data.get("doctors", {}).get(str(doctor_id), {})
+    # Получаем скомпилированное расписание врача
+    compiled_schedule = get_compiled_schedule(doctor_id)
     
-    if not schedule:
+    if not compiled_schedule:
         await callback.message.edit_text(
             "❌ У вас не настроено расписание. Пожалуйста, настройте расписание через раздел '📅 Расписание'.",
             reply_markup=basic.main_menu()
@@ -83,12 +147,15 @@ async def show_doctor_appointments(callback: types.CallbackQuery, doctor_id: int
     # Начинаем с сегодняшнего дня
     current_date = datetime.now().date()
     
-    # Сохраняем данные в состоянии для пагинации
-    await state.update_data(
+    # В состоянии храним только курсор пагинации, само расписание берется из общего кэша
+    data = await state.get_data()
+    data.pop("schedule", None)
+    data.update(
         doctor_id=doctor_id,
         current_date=current_date.isoformat(),
-        schedule=schedule
+        schedule_version=compiled_schedule.version
     )
+    await state.set_data(data)
     
     # Показываем первую страницу (сегодня)
     await show_doctor_appointments_page(callback, state)
@@ -98,9 +165,9 @@ async def show_doctor_appointments_page(callback: types.CallbackQuery, state: FS
     data = await state.get_data()
     doctor_id = data.get("doctor_id")
     current_date_str = data.get("current_date")
-    schedule = data.get("schedule")
+    compiled_schedule = await get_agenda_schedule(state, data)
     
-    if not all([doctor_id, current_date_str, schedule]):
+    if not all([doctor_id, current_date_str, compiled_schedule]):
         await callback.message.edit_text(
             "❌ Ошибка загрузки данных.",
             reply_markup=basic.main_menu()
@@ -110,17 +177,24 @@ async def show_doctor_appointments_page(callback: types.CallbackQuery, state: FS
     # Преобразуем дату
     current_date = datetime.fromisoformat(current_date_str).date()
     
-    # Проверяем, является ли день выходным
-    weekends = get_doctor_weekends(int(doctor_id))
-    weekday = current_date.weekday()  # 0-понедельник, 6-воскресенье
-    
-    if weekday in weekends:
-        # Если сегодня выходной, переходим к следующему рабочему дню
-        next_date = find_next_working_day(current_date, weekends)
+    # Загружаем записи один раз: они нужны и для навигации, и для текущего дня
+    appointments_data = load_json_data('appointments')
+    day_index = build_doctor_day_index(doctor_id, appointments_data)
+    skip_empty_days = data.get("skip_empty_days", False)
+    navigation_days = get_navigation_days(doctor_id, skip_empty_days, day_index)
+    
+    # Если день нерабочий (или без записей), переходим к ближайшему подходящему дню
+    if not is_navigation_day(current_date, navigation_days):
+        next_date = (find_next_working_day(current_date, navigation_days)
+                     or find_prev_working_day(current_date, navigation_days))
         if next_date:
             await state.update_data(current_date=next_date.isoformat())
             current_date = next_date
             current_date_str = next_date.isoformat()
+        elif skip_empty_days:
+            await state.update_data(skip_empty_days=False)
+            await callback.answer("❌ Нет дней с записями", show_alert=True)
+            return
         else:
             await callback.message.edit_text(
                 "❌ Нет доступных рабочих дней.",
@@ -129,31 +203,94 @@ async def show_doctor_appointments_page(callback: types.CallbackQuery, state: FS
             await callback.answer()
             return
     
-    # Получаем все записи врача на эту дату
-    appointments_data = load_json_data('appointments')
-    day_appointments = []
+    # Получаем записи врача на эту дату по индексу дней
+    day_appointments = day_index.get(current_date_str, [])
+    appointments_by_start = map_appointments_by_start(day_appointments)
     
-    for appointment in appointments_data.get("appointments", {}).values():
-        if (appointment["doctor_id"] == str(doctor_id) and 
-            appointment["date"] == current_date_str):
-            day_appointments.append(appointment)
+    # Данные всех пациентов дня - одним чтением users.json
+    patients = get_users_data({appointment["patient_id"] for appointment in day_appointments})
     
-    # Генерируем интервалы расписания
-    time_slots = generate_time_slots(schedule, current_date_str)
+    # Интервалы расписания берем из скомпилированного расписания
+    time_slots = compiled_schedule.slots_for(current_date)
     
     # Формируем текст для отображения
+    page_text = render_day_text(current_date, time_slots, appointments_by_start, patients)
+    
+    # Формируем навигацию
+    prev_date = find_prev_working_day(current_date, navigation_days)
+    next_date = find_next_working_day(current_date, navigation_days)
+    
+    # Создаем клавиатуру с пагинацией
+    builder = InlineKeyboardBuilder()
+    
+    nav_buttons = []
+    
+    if prev_date:
+        nav_buttons.append(types.InlineKeyboardButton(
+            text="◀️ Назад", 
+            callback_data="appointments_prev"
+        ))
+    
+    if next_date:
+        nav_buttons.append(types.InlineKeyboardButton(
+            text="Вперед ▶️", 
+            callback_data="appointments_next"
+        ))
+    
+    if nav_buttons:
+        builder.row(*nav_buttons)
+    
+    builder.row(types.InlineKeyboardButton(
+        text="✅ Подтверждение записей",
+        callback_data="pending_review"
+    ))
+    
+    builder.row(*[
+        types.InlineKeyboardButton(
+            text=f"🗓 {days} дней",
+            callback_data=f"appointments_range_{days}"
+        )
+        for days in RANGE_DAYS_OPTIONS
+    ])
+    
+    builder.row(types.InlineKeyboardButton(
+        text="📅 Все рабочие дни" if skip_empty_days else "📋 Только дни с записями",
+        callback_data="appointments_toggle_empty"
+    ))
+    
+    builder.row(types.InlineKeyboardButton(
+        text="🏠 На главную", 
+        callback_data="exit"
+    ))
+    
+    await callback.message.edit_text(page_text, reply_markup=builder.as_markup())
+    await callback.answer()
+
+@router.callback_query(F.data == 'appointments_toggle_empty')
+async def toggle_empty_days(callback: types.CallbackQuery, state: FSMContext):
+    """Включает/выключает пропуск дней без записей при навигации"""
+    data = await state.get_data()
+    
+    if not data.get("doctor_id"):
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
+    
+    await state.update_data(skip_empty_days=not data.get("skip_empty_days", False))
+    await show_doctor_appointments_page(callback, state)
+
+def render_day_text(current_date, time_slots, appointments_by_start: dict, patients: dict) -> str:
+    """Формирует текст записей врача за один день"""
     day_name = get_month_name(current_date.month)
-    page_text = f"{current_date.day} {day_name}:\n\n"
+    day_text = f"{current_date.day} {day_name}:\n\n"
     
     # Сопоставляем записи с интервалами
-    for slot in time_slots:
+    for start, end, label in time_slots:
         # Ищем запись на этот интервал
-        appointment = find_appointment_for_slot(day_appointments, slot["start"], slot["end"])
+        appointment = appointments_by_start.get(format_minutes(start))
         
         if appointment:
             # Получаем данные пациента
-            patient_id = appointment["patient_id"]
-            patient_data = get_user_data(int(patient_id))
+            patient_data = patients.get(appointment["patient_id"])
             
             # Получаем name пациента
             name = patient_data.get("first_name", "") + ' ' + patient_data.get("last_name", "") if patient_data else ""
@@ -163,43 +300,367 @@ async def show_doctor_appointments_page(callback: types.CallbackQuery, state: FS
             phone_clean = ''.join(filter(str.isdigit, phone))
             
             # Формируем строку с временем и данными пациента
-            page_text += f"{slot['start']}-{slot['end']} +{phone_clean} {name}\n"
+            day_text += f"{label} +{phone_clean} {name}\n"
         else:
             # Пустой интервал
-            page_text += f"{slot['start']}-{slot['end']} ----------------\n"
+            day_text += f"{label} ----------------\n"
     
-    # Формируем навигацию
-    prev_date = find_prev_working_day(current_date, weekends)
-    next_date = find_next_working_day(current_date, weekends)
+    return day_text
+
+@router.callback_query(F.data.regexp(r'^appointments_range_\d+$'))
+async def show_doctor_range(callback: types.CallbackQuery, state: FSMContext):
+    """Открывает просмотр записей врача за период, начиная с текущего дня пагинации"""
+    days = int(callback.data.removeprefix('appointments_range_'))
+    data = await state.get_data()
     
-    # Создаем клавиатуру с пагинацией
-    builder = InlineKeyboardBuilder()
+    if not data.get("doctor_id") or not data.get("current_date") or days not in RANGE_DAYS_OPTIONS:
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
     
-    nav_buttons = []
+    await state.update_data(range_start=data["current_date"], range_days=days, range_page=0)
+    await show_doctor_range_page(callback, state, rebuild=True)
+
+@router.callback_query(F.data.in_({'appointments_range_prev', 'appointments_range_next'}))
+async def shift_doctor_range(callback: types.CallbackQuery, state: FSMContext):
+    """Сдвигает период просмотра записей на его длину назад или вперед"""
+    data = await state.get_data()
     
-    if prev_date:
-        nav_buttons.append(types.InlineKeyboardButton(
-            text="◀️ Назад", 
-            callback_data="appointments_prev"
-        ))
+    if not data.get("range_start") or not data.get("range_days"):
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
     
-    if next_date:
-        nav_buttons.append(types.InlineKeyboardButton(
-            text="Вперед ▶️", 
-            callback_data="appointments_next"
-        ))
+    days = data["range_days"]
+    shift = -days if callback.data == 'appointments_range_prev' else days
+    range_start = datetime.fromisoformat(data["range_start"]).date() + timedelta(days=shift)
     
-    if nav_buttons:
-        builder.row(*nav_buttons)
+    await state.update_data(range_start=range_start.isoformat(), range_page=0)
+    await show_doctor_range_page(callback, state, rebuild=True)
+
+@router.callback_query(F.data.regexp(r'^appointments_range_page_\d+$'))
+async def switch_doctor_range_page(callback: types.CallbackQuery, state: FSMContext):
+    """Переключает страницу текста в просмотре за период (без повторного чтения файлов)"""
+    await state.update_data(range_page=int(callback.data.removeprefix('appointments_range_page_')))
+    await show_doctor_range_page(callback, state)
+
+@router.callback_query(F.data == 'appointments_day')
+async def back_to_day_view(callback: types.CallbackQuery, state: FSMContext):
+    """Возвращает из просмотра за период к просмотру по дням"""
+    data = await state.get_data()
+    
+    if data.get("range_start"):
+        await state.update_data(current_date=data["range_start"])
+    await show_doctor_appointments_page(callback, state)
+
+async def show_doctor_range_page(callback: types.CallbackQuery, state: FSMContext, rebuild: bool = False):
+    """Показывает одну страницу записей врача за период"""
+    data = await state.get_data()
+    doctor_id = data.get("doctor_id")
+    
+    # Данные состояния могли истечь или пропасть после перезапуска
+    if not data.get("range_start") or not data.get("range_days"):
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
+    
+    compiled_schedule = await get_agenda_schedule(state, data)
+    
+    if not compiled_schedule:
+        await callback.message.edit_text(
+            "❌ У вас не настроено расписание. Пожалуйста, настройте расписание через раздел '📅 Расписание'.",
+            reply_markup=basic.main_menu()
+        )
+        await callback.answer()
+        return
     
+    range_start = datetime.fromisoformat(data["range_start"]).date()
+    days = data["range_days"]
+    
+    # Страницы строятся один раз на период и переиспользуются при листании
+    cached = doctor_appointments_data.get(str(doctor_id))
+    cache_key = (range_start.isoformat(), days, compiled_schedule.version)
+    if rebuild or not cached or cached["key"] != cache_key:
+        pages = list(iter_range_pages(build_range_day_texts(doctor_id, compiled_schedule, range_start, days)))
+        doctor_appointments_data[str(doctor_id)] = {"key": cache_key, "pages": pages}
+    else:
+        pages = cached["pages"]
+    
+    page = max(0, min(data.get("range_page", 0), len(pages) - 1))
+    range_end = range_start + timedelta(days=days - 1)
+    
+    page_text = (f"🗓 Записи с {range_start.day} {get_month_name(range_start.month)} "
+                 f"по {range_end.day} {get_month_name(range_end.month)}\n\n" + pages[page])
+    
+    # Создаем клавиатуру: листание страниц текста и сдвиг периода
+    builder = InlineKeyboardBuilder()
+    
+    if len(pages) > 1:
+        page_buttons = []
+        if page > 0:
+            page_buttons.append(types.InlineKeyboardButton(
+                text="◀️",
+                callback_data=f"appointments_range_page_{page - 1}"
+            ))
+        page_buttons.append(types.InlineKeyboardButton(
+            text=f"{page + 1}/{len(pages)}",
+            callback_data="ignore"
+        ))
+        if page < len(pages) - 1:
+            page_buttons.append(types.InlineKeyboardButton(
+                text="▶️",
+                callback_data=f"appointments_range_page_{page + 1}"
+            ))
+        builder.row(*page_buttons)
+    
+    builder.row(
+        types.InlineKeyboardButton(text=f"◀️ -{days} дн.", callback_data="appointments_range_prev"),
+        types.InlineKeyboardButton(text=f"+{days} дн. ▶️", callback_data="appointments_range_next")
+    )
     builder.row(types.InlineKeyboardButton(
-        text="🏠 На главную", 
+        text="📅 По дням",
+        callback_data="appointments_day"
+    ))
+    builder.row(types.InlineKeyboardButton(
+        text="🏠 На главную",
         callback_data="exit"
     ))
     
     await callback.message.edit_text(page_text, reply_markup=builder.as_markup())
     await callback.answer()
 
+async def get_agenda_schedule(state: FSMContext, data: dict):
+    """Возвращает скомпилированное расписание врача по версии из курсора пагинации"""
+    doctor_id = data.get("doctor_id")
+    if not doctor_id:
+        return None
+    
+    compiled_schedule = get_compiled_schedule(doctor_id, version=data.get("schedule_version"))
+    
+    # Расписание изменилось, пока врач листал записи, - запоминаем новую версию
+    if compiled_schedule and compiled_schedule.version != data.get("schedule_version"):
+        await state.update_data(schedule_version=compiled_schedule.version)
+    
+    return compiled_schedule
+
+def build_range_day_texts(doctor_id, compiled_schedule, range_start, days: int):
+    """Формирует тексты дней периода из одного запроса к индексу записей и одной выборки пациентов"""
+    range_end = range_start + timedelta(days=days - 1)
+    range_appointments = get_doctor_appointments_in_range(
+        doctor_id, range_start.isoformat(), range_end.isoformat()
+    )
+    
+    # Данные всех пациентов периода - одним чтением users.json
+    patients = get_users_data({
+        appointment["patient_id"]
+        for day_appointments in range_appointments.values()
+        for appointment in day_appointments
+    })
+    
+    working_days = get_doctor_working_days(int(doctor_id))
+    
+    for i in range(days):
+        current_date = range_start + timedelta(days=i)
+        
+        if not is_navigation_day(current_date, working_days):
+            yield f"{current_date.day} {get_month_name(current_date.month)}: выходной\n"
+            continue
+        
+        day_appointments = range_appointments.get(current_date.isoformat(), [])
+        time_slots = compiled_schedule.slots_for(current_date)
+        yield render_day_text(current_date, time_slots, map_appointments_by_start(day_appointments), patients)
+
+def iter_range_pages(day_texts, page_length: int = RANGE_PAGE_LENGTH):
+    """Собирает тексты дней в страницы, не превышающие page_length символов"""
+    page = ""
+    for day_text in day_texts:
+        if page and len(page) + len(day_text) + 1 > page_length:
+            yield page
+            page = ""
+        
+        # День длиннее страницы режем по строкам
+        while len(day_text) > page_length:
+            cut = day_text.rfind("\n", 0, page_length) + 1 or page_length
+            yield day_text[:cut]
+            day_text = day_text[cut:]
+        
+        page += day_text + "\n"
+    
+    if page:
+        yield page
+
+@router.callback_query(F.data == 'pending_review')
+async def show_pending_review(callback: types.CallbackQuery, state: FSMContext):
+    """Показывает будущие неподтвержденные записи врача для пакетного подтверждения"""
+    data = await state.get_data()
+    doctor_id = data.get("doctor_id")
+    
+    if not doctor_id:
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
+    
+    today = datetime.now().date().isoformat()
+    day_index = build_doctor_day_index(doctor_id)
+    pending = [
+        appointment
+        for date_str in sorted(day_index)
+        if date_str >= today
+        for appointment in day_index[date_str]
+        if appointment["status"] == "pending"
+    ]
+    
+    if not pending:
+        await callback.answer("Нет записей, ожидающих подтверждения", show_alert=True)
+        return
+    
+    await state.update_data(
+        pending_ids=[appointment["appointment_id"] for appointment in pending],
+        pending_selected=[],
+        pending_page=0
+    )
+    await render_pending_review(callback, state, pending)
+
+@router.callback_query(F.data.startswith('pending_page_'))
+async def switch_pending_page(callback: types.CallbackQuery, state: FSMContext):
+    """Переключает страницу списка подтверждения (отметки на других страницах сохраняются)"""
+    page = callback.data.removeprefix('pending_page_')
+    data = await state.get_data()
+    
+    if not page.isdigit() or not data.get("pending_ids"):
+        await callback.answer("❌ Ошибка данных", show_alert=True)
+        return
+    
+    await state.update_data(pending_page=int(page))
+    await render_pending_review(callback, state, get_pending_appointments(data["pending_ids"]))
+
+@router.callback_query(F.data.startswith('pending_toggle_') | (F.data == 'pending_select_all'))
+async def toggle_pending_selection(callback: types.CallbackQuery, state: FSMContext):
+    """Отмечает/снимает отметку с записи (или со всех сразу) в списке подтверждения"""
+    data = await state.get_data()
+    pending_ids = data.get("pending_ids") or []
+    selected = set(data.get("pending_selected") or [])
+    pending = get_pending_appointments(pending_ids)
+    
+    if callback.data == 'pending_select_all':
+        # Отмечаются (или снимаются) все записи текущей страницы
+        _, _, page_appointments = get_pending_page(pending, data.get("pending_page", 0))
+        page_ids = {appointment["appointment_id"] for appointment in page_appointments}
+        selected = selected - page_ids if page_ids <= selected else selected | page_ids
+    else:
+        appointment_id = callback.data.removeprefix('pending_toggle_')
+        if appointment_id not in pending_ids:
+            await callback.answer("❌ Запись не найдена!", show_alert=True)
+            return
+        selected ^= {appointment_id}
+    
+    await state.update_data(pending_selected=list(selected))
+    await render_pending_review(callback, state, pending)
+
+@router.callback_query(F.data.in_({'pending_apply_confirm', 'pending_apply_decline'}))
+async def apply_pending_decision(callback: types.CallbackQuery, state: FSMContext):
+    """Подтверждает или отклоняет выбранные записи одной записью файла и одной пачкой уведомлений"""
+    data = await state.get_data()
+    doctor_id = data.get("doctor_id")
+    selected = set(data.get("pending_selected", []))
+    
+    if not selected:
+        await callback.answer("Отметьте хотя бы одну запись", show_alert=True)
+        return
+    
+    confirm = callback.data == 'pending_apply_confirm'
+    new_status = "confirmed" if confirm else "cancelled"
+    
+    changed = []
+    with json_transaction('appointments') as appointments_data:
+        for appointment_id in selected:
+            appointment = appointments_data.get("appointments", {}).get(appointment_id)
+            # Статус мог измениться, пока врач выбирал записи
+            if (appointment and appointment["doctor_id"] == str(doctor_id)
+                    and appointment["status"] == "pending"):
+                appointment["status"] = new_status
+                changed.append(appointment)
+    
+    # Пациентам - итог по их записям, листу ожидания - освободившиеся после отклонения слоты
+    messages = []
+    for appointment in sorted(changed, key=lambda x: (x["date"], x["time_slot"])):
+        date_obj = datetime.strptime(appointment["date"], "%Y-%m-%d")
+        date_text = f"{date_obj.day} {get_month_name(date_obj.month)} {date_obj.year}, {appointment['time_slot']}"
+        text = (f"✅ Ваша запись на {date_text} подтверждена врачом" if confirm
+                else f"❌ Ваша запись на {date_text} отклонена врачом, пожалуйста, запишитесь на другое время")
+        messages.append((int(appointment["patient_id"]), text))
+    
+    if not confirm:
+        messages.extend(build_slot_released_messages(changed))
+    
+    enqueue_notifications(callback.bot, messages)
+    
+    await state.update_data(pending_ids=None, pending_selected=None, pending_page=None)
+    
+    result = "Подтверждено" if confirm else "Отклонено"
+    await callback.answer(f"{result} записей: {len(changed)}", show_alert=True)
+    await show_doctor_appointments_page(callback, state)
+
+def get_pending_appointments(pending_ids: list) -> list:
+    """Возвращает записи списка подтверждения (в его порядке) одним чтением файла"""
+    appointments = load_json_data('appointments').get("appointments", {})
+    return [appointments[app_id] for app_id in pending_ids if app_id in appointments]
+
+def get_pending_page(pending: list, page: int) -> tuple:
+    """Возвращает (номер страницы в допустимых пределах, число страниц, записи страницы)"""
+    total_pages = max(1, (len(pending) + PENDING_PAGE_SIZE - 1) // PENDING_PAGE_SIZE)
+    page = max(0, min(page, total_pages - 1))
+    first_index = page * PENDING_PAGE_SIZE
+    return page, total_pages, pending[first_index:first_index + PENDING_PAGE_SIZE]
+
+async def render_pending_review(callback: types.CallbackQuery, state: FSMContext, pending: list):
+    """Рисует страницу списка неподтвержденных записей с отметками"""
+    data = await state.get_data()
+    selected = set(data.get("pending_selected") or [])
+    page, total_pages, page_appointments = get_pending_page(pending, data.get("pending_page", 0))
+    
+    text = f"⏳ Записи, ожидающие подтверждения: {len(pending)}\n"
+    text += "Отметьте записи и выберите действие.\n"
+    if total_pages > 1:
+        text += "Отметки сохраняются при переходе между страницами.\n"
+    text += "\n"
+    
+    builder = InlineKeyboardBuilder()
+    for appointment in page_appointments:
+        date_obj = datetime.strptime(appointment["date"], "%Y-%m-%d")
+        mark = "☑️" if appointment["appointment_id"] in selected else "⬜"
+        builder.row(types.InlineKeyboardButton(
+            text=f"{mark} {date_obj.day:02d}.{date_obj.month:02d} {appointment['time_slot']} {appointment['patient_fio']}",
+            callback_data=f"pending_toggle_{appointment['appointment_id']}"
+        ))
+    
+    # Навигация по страницам
+    if total_pages > 1:
+        nav_buttons = []
+        if page > 0:
+            nav_buttons.append(types.InlineKeyboardButton(
+                text="◀️",
+                callback_data=f"pending_page_{page - 1}"
+            ))
+        nav_buttons.append(types.InlineKeyboardButton(
+            text=f"{page + 1}/{total_pages}",
+            callback_data="ignore"
+        ))
+        if page < total_pages - 1:
+            nav_buttons.append(types.InlineKeyboardButton(
+                text="▶️",
+                callback_data=f"pending_page_{page + 1}"
+            ))
+        builder.row(*nav_buttons)
+    
+    select_text = "☑️ Выбрать все на странице" if total_pages > 1 else "☑️ Выбрать все"
+    builder.row(types.InlineKeyboardButton(text=select_text, callback_data="pending_select_all"))
+    builder.row(
+        types.InlineKeyboardButton(text=f"✅ Подтвердить ({len(selected)})", callback_data="pending_apply_confirm"),
+        types.InlineKeyboardButton(text=f"❌ Отклонить ({len(selected)})", callback_data="pending_apply_decline")
+    )
+    builder.row(types.InlineKeyboardButton(text="📅 К записям", callback_data="appointments_day"))
+    builder.row(types.InlineKeyboardButton(text="🏠 На главную", callback_data="exit"))
+    
+    await callback.message.edit_text(text, reply_markup=builder.as_markup())
+    await callback.answer()
+
 @router.callback_query(F.data == 'appointments_prev')
 async def appointments_prev_page(callback: types.CallbackQuery, state: FSMContext):
     """Переход на предыдущий рабочий день"""
@@ -212,9 +673,9 @@ async def appointments_prev_page(callback: types.CallbackQuery, state: FSMContex
         return
     
     current_date = datetime.fromisoformat(current_date_str).date()
-    weekends = get_doctor_weekends(int(doctor_id))
+    navigation_days = get_navigation_days(doctor_id, data.get("skip_empty_days", False))
     
-    prev_date = find_prev_working_day(current_date, weekends)
+    prev_date = find_prev_working_day(current_date, navigation_days)
     
     if prev_date:
         await state.update_data(current_date=prev_date.isoformat())
@@ -234,9 +695,9 @@ async def appointments_next_page(callback: types.CallbackQuery, state: FSMContex
         return
     
     current_date = datetime.fromisoformat(current_date_str).date()
-    weekends = get_doctor_weekends(int(doctor_id))
+    navigation_days = get_navigation_days(doctor_id, data.get("skip_empty_days", False))
     
-    next_date = find_next_working_day(current_date, weekends)
+    next_date = find_next_working_day(current_date, navigation_days)
     
     if next_date:
         await state.update_data(current_date=next_date.isoformat())
@@ -244,89 +705,30 @@ async def appointments_next_page(callback: types.CallbackQuery, state: FSMContex
     else:
         await callback.answer("❌ Нет следующих рабочих дней", show_alert=True)
 
-def find_next_working_day(current_date, weekends, max_days=365):
-    """Находит следующий рабочий день, пропуская выходные"""
-    for i in range(1, max_days + 1):
-        next_date = current_date + timedelta(days=i)
-        if next_date.weekday() not in weekends:
-            return next_date
-    return None
-
-def find_prev_working_day(current_date, weekends, max_days=365):
-    """Находит предыдущий рабочий день, пропуская выходные"""
-    for i in range(1, max_days + 1):
-        prev_date = current_date - timedelta(days=i)
-        if prev_date.weekday() not in weekends:
-            return prev_date
-    return None
-
-def generate_time_slots(schedule, date_str):
-    """Генерирует временные интервалы на основе расписания врача"""
-    slots = []
-    
-    # Парсим время из расписания
-    patient_time = schedule.get("patient_time", 30)  # по умолчанию 30 минут
-    
-    # Первичные приемы
-    primary_start = schedule.get("primary_start", "09:00")
-    primary_end = schedule.get("primary_end", "13:00")
-    
-    # Повторные приемы
-    repeat_start = schedule.get("repeat_start", "14:00")
-    repeat_end = schedule.get("repeat_end", "18:00")
-    
-    # Генерируем интервалы для первичных приемов
-    if primary_start and primary_end:
-        slots.extend(generate_slots_for_period(primary_start, primary_end, patient_time))
-    
-    # Генерируем интервалы для повторных приемов
-    if repeat_start and repeat_end:
-        slots.extend(generate_slots_for_period(repeat_start, repeat_end, patient_time))
-    
-    return slots
-
-def generate_slots_for_period(start_time_str, end_time_str, slot_duration_minutes):
-    """Генерирует временные интервалы для заданного периода"""
-    slots = []
-    
-    # Преобразуем строки времени в минуты
-    start_hour, start_minute = map(int, start_time_str.split(':'))
-    end_hour, end_minute = map(int, end_time_str.split(':'))
-    
-    start_total = start_hour * 60 + start_minute
-    end_total = end_hour * 60 + end_minute
-    
-    current_time = start_total
-    
-    while current_time + slot_duration_minutes <= end_total:
-        # Начало интервала
-        start_h = current_time // 60
-        start_m = current_time % 60
-        start_str = f"{start_h:02d}:{start_m:02d}"
-        
-        # Конец интервала
-        end_time = current_time + slot_duration_minutes
-        end_h = end_time // 60
-        end_m = end_time % 60
-        end_str = f"{end_h:02d}:{end_m:02d}"
-        
-        slots.append({
-            "start": start_str,
-            "end": end_str,
-            "start_total": current_time,
-            "end_total": end_time
-        })
-        
-        current_time += slot_duration_minutes
-    
-    return slots
+def get_navigation_days(doctor_id, skip_empty_days: bool, day_index: dict = None) -> list:
+    """Возвращает отсортированный список дней для навигации по записям врача"""
+    working_days = get_doctor_working_days(int(doctor_id))
+    if not skip_empty_days:
+        return working_days
+    
+    if day_index is None:
+        day_index = build_doctor_day_index(doctor_id)
+    return [day for day in working_days if day.isoformat() in day_index]
+
+def is_navigation_day(current_date, days) -> bool:
+    """Проверяет наличие дня в отсортированном списке (бинарный поиск)"""
+    index = bisect_left(days, current_date)
+    return index < len(days) and days[index] == current_date
 
-def find_appointment_for_slot(appointments, slot_start, slot_end):
-    """Находит запись на указанный временной интервал"""
-    for appointment in appointments:
-        if appointment.get("time_slot", "").startswith(f"{slot_start}-"):
-            return appointment
-    return None
+def find_next_working_day(current_date, days):
+    """Находит следующий рабочий день в отсортированном списке (бинарный поиск)"""
+    index = bisect_right(days, current_date)
+    return days[index] if index < len(days) else None
+
+def find_prev_working_day(current_date, days):
+    """Находит предыдущий рабочий день в отсортированном списке (бинарный поиск)"""
+    index = bisect_left(days, current_date)
+    return days[index - 1] if index > 0 else None
 
 def format_appointment_text(appointment: dict) -> str:
     """Форматирует полный текст записи (для пациента)"""
@@ -353,6 +755,21 @@ def format_appointment_text(appointment: dict) -> str:
 📞 Телефон: {appointment["patient_phone"]}
 📊 Статус: {status_text}"""
 
+def format_appointment_short_text(appointment: dict, number: int, doctor_data: dict = None) -> str:
+    """Форматирует краткий текст записи для списка пациента"""
+    doctor_name = doctor_data["registration_data"]["fio"] if doctor_data else "Неизвестный врач"
+    
+    date_obj = datetime.strptime(appointment["date"], "%Y-%m-%d")
+    month = get_month_name(date_obj.month)
+    
+    type_text = "Первичный" if appointment["appointment_type"] == "primary" else "Вторичный"
+    status_text = get_status_text(appointment["status"])
+    
+    return f"""{number}. 📅 {date_obj.day} {month} {date_obj.year}, ⏰ {appointment["time_slot"]}
+   👨‍⚕️ {doctor_name}
+   🎯 {type_text} | {status_text}
+"""
+
 def get_status_text(status: str) -> str:
     """Возвращает текстовое представление статуса"""
     status_map = {
@@ -363,40 +780,39 @@ def get_status_text(status: str) -> str:
     return status_map.get(status, "❓ Неизвестно")
 
 @router.callback_query(F.data.startswith('delete_appointment_'))
-async def delete_appointment(callback: types.CallbackQuery):
+async def delete_appointment(callback: types.CallbackQuery, state: FSMContext):
     """Удаляет запись пациента"""
-    appointment_id = callback.data.split('_')[2]
+    # ID записи сам содержит "_" (app_<time>_<rand>), поэтому отрезаем только префикс
+    appointment_id = callback.data.removeprefix('delete_appointment_')
     
-    appointments_data = load_json_data('appointments')
+    with json_transaction('appointments') as appointments_data:
+        appointment = appointments_data.get("appointments", {}).get(appointment_id)
+        
+        # Удаляем только собственную запись пользователя
+        is_owner = appointment is not None and appointment["patient_id"] == str(callback.from_user.id)
+        if is_owner:
+            remove_appointments(appointments_data, [appointment_id])
     
     # Проверяем существование записи
-    if appointment_id not in appointments_data.get("appointments", {}):
+    if appointment is None:
         await callback.answer("❌ Запись не найдена!", show_alert=True)
         return
     
-    appointment = appointments_data["appointments"][appointment_id]
-    
     # Проверяем, что запись принадлежит текущему пользователю
-    if appointment["patient_id"] != str(callback.from_user.id):
+    if not is_owner:
         await callback.answer("❌ Вы не можете удалить эту запись!", show_alert=True)
         return
     
-    # Удаляем запись
-    del appointments_data["appointments"][appointment_id]
-    
-    # Удаляем запись из списка врача
-    doctor_id = appointment["doctor_id"]
-    if (doctor_id in appointments_data.get("doctors", {}) and 
-        "appointments" in appointments_data["doctors"][doctor_id]):
-        appointments_data["doctors"][doctor_id]["appointments"] = [
-            app_id for app_id in appointments_data["doctors"][doctor_id]["appointments"]
-            if app_id != appointment_id
-        ]
-    
-    # Сохраняем изменения
-    save_json_data(appointments_data, 'appointments')
+    # Слот освободился - сообщаем ожидающим этот день
+    publish_slot_released(callback.bot, appointment)
     
     await callback.answer("✅ Запись успешно удалена!", show_alert=True)
     
-    # Удаляем сообщение с записью
-    await callback.message.delete()
\ No newline at end of file
+    # Перерисовываем текущую страницу списка одним редактированием
+    data = await state.get_data()
+    await show_patient_appointments(
+        callback,
+        callback.from_user.id,
+        state,
+        data.get("patient_appointments_page", 0)
+    )
\ No newline at end of file
@@ -3,6 +3,8 @@ from aiogram.fsm.context import FSMContext
 from keyboards.basic import MainMenu as basic
 from handlers.states import States
 from user_utils import is_user_registered, get_user_data
+from JSONfunctions import get_data_version
+from view_cache import get_cached_view, store_view
 from datetime import datetime
 
 router = Router()
@@ -11,15 +13,32 @@ router = Router()
 async def show_user_profile(callback: types.CallbackQuery):
     """Показывает информацию о пользователе в личном кабинете"""
     
-    # Проверяем, зарегистрирован ли пользователь
-    if not is_user_registered(callback.from_user.id):
-        await callback.answer("❌ Вы еще не зарегистрированы!", show_alert=True)
-        return
+    # Пока users.json не менялся, профиль берется готовым - без чтения файла
+    version = (get_data_version('users'), callback.from_user.full_name)
+    profile_text = get_cached_view("profile", callback.from_user.id, version)
     
-    # Получаем данные пользователя
-    user_data = get_user_data(callback.from_user.id)
-    reg_data = user_data["registration_data"]
+    if profile_text is None:
+        # Проверяем, зарегистрирован ли пользователь
+        if not is_user_registered(callback.from_user.id):
+            await callback.answer("❌ Вы еще не зарегистрированы!", show_alert=True)
+            return
+        
+        # Получаем данные пользователя
+        user_data = get_user_data(callback.from_user.id)
+        profile_text = store_view(
+            "profile", callback.from_user.id, version,
+            render_profile_text(user_data["registration_data"], callback.from_user.full_name)
+        )
     
+    # Отправляем сообщение с профилем
+    await callback.message.edit_text(
+        profile_text,
+        reply_markup=basic.exit()
+    )
+    await callback.answer()
+
+def render_profile_text(reg_data: dict, full_name: str) -> str:
+    """Формирует текст личного кабинета"""
     # Формируем текст профиля
     role_text = "👨‍⚕️ Врач" if reg_data["role"] == "doctor" else "👤 Пациент"
     phone = reg_data.get("phone", "Не указано")
@@ -28,7 +47,7 @@ async def show_user_profile(callback: types.CallbackQuery):
 📊 Личный кабинет
 
 {role_text}
-📝 Имя: {callback.from_user.full_name}
+📝 Имя: {full_name}
 📞 Телефон: {phone}
 """
     
@@ -54,9 +73,4 @@ async def show_user_profile(callback: types.CallbackQuery):
         except:
             pass
     
-    # Отправляем сообщение с профилем
-    await callback.message.edit_text(
-        profile_text,
-        reply_markup=basic.exit()
-    )
-    await callback.answer()
\ No newline at end of file
+    return profile_text
\ No newline at end of file
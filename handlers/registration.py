@@ -2,9 +2,11 @@ from aiogram import Router, types, F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from keyboards.basic import MainMenu as basic
-from JSONfunctions import load_json_data, save_json_data
+from JSONfunctions import json_transaction
 from handlers.states import States
 from user_utils import is_user_registered, get_user_data
+from view_cache import invalidate_views
+from edit_coalescer import cancel_edit
 
 router = Router()
 
@@ -27,6 +29,8 @@ async def start_handler(update: types.Message | types.CallbackQuery, state: FSMC
         markup = basic.start()
     
     if is_callback:
+        # Отложенная правка календаря выходных не должна перезаписать главное меню
+        cancel_edit(message)
         await message.edit_text(text, reply_markup=markup)
         await update.answer()
     else:
@@ -299,27 +303,28 @@ async def save_registration_data(callback: types.CallbackQuery, state: FSMContex
     data = await state.get_data()
     user_id = str(callback.from_user.id)
     
-    users_data = load_json_data('users')
-    
-    users_data["users"][user_id] = {
-        "user_id": user_id,
-        "username": callback.from_user.username or "",
-        "first_name": callback.from_user.first_name or "",
-        "last_name": callback.from_user.last_name or "",
-        "registration_data": {
-            "role": data.get('registration_role'),
-            "fio": data.get('registration_fio'),
-            "birth_date": data.get('registration_birth_date'),  # Новое поле
-            "phone": data.get('registration_phone'),            # Новое поле
-            "office_address": data.get('registration_office_address'),
-            "specialty": data.get('registration_specialty'),
-            "website_link": data.get('registration_website_link'),
-            "photo_file_id": data.get('registration_photo'),
-            "registration_date": callback.message.date.isoformat() if callback.message else ""
+    with json_transaction('users') as users_data:
+        # Версия записи нужна кэшу готовых карточек
+        previous_version = users_data["users"].get(user_id, {}).get("version", 0)
+        users_data["users"][user_id] = {
+            "user_id": user_id,
+            "version": previous_version + 1,
+            "username": callback.from_user.username or "",
+            "first_name": callback.from_user.first_name or "",
+            "last_name": callback.from_user.last_name or "",
+            "registration_data": {
+                "role": data.get('registration_role'),
+                "fio": data.get('registration_fio'),
+                "birth_date": data.get('registration_birth_date'),  # Новое поле
+                "phone": data.get('registration_phone'),            # Новое поле
+                "office_address": data.get('registration_office_address'),
+                "specialty": data.get('registration_specialty'),
+                "website_link": data.get('registration_website_link'),
+                "photo_file_id": data.get('registration_photo'),
+                "registration_date": callback.message.date.isoformat() if callback.message else ""
+            }
         }
-    }
-    
-    save_json_data(users_data, 'users')
+    invalidate_views(user_id)
     
     await callback.message.edit_text(
         "✅ Регистрация завершена! Ваши данные сохранены.",
@@ -12,8 +12,8 @@ class WeekendSelectionKeyboard:
     DAYS_RU = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
     
     @staticmethod
-    def create_calendar(year: int, month: int, selected_dates: set) -> InlineKeyboardMarkup:
-        """Создает календарь для выбора выходных с уже выбранными датами"""
+    def create_calendar(year: int, month: int, selected_dates: set, weekday_mask: int = 0) -> InlineKeyboardMarkup:
+        """Создает календарь для выбора выходных с уже выбранными датами и днями недели"""
         builder = InlineKeyboardBuilder()
         today = datetime.now().date()
         
@@ -21,9 +21,12 @@ class WeekendSelectionKeyboard:
         header = f"{WeekendSelectionKeyboard.MONTHS_RU[month-1]} {year}"
         builder.row(InlineKeyboardButton(text=header, callback_data="ignore"))
         
-        # Добавляем дни недели
-        for day_name in WeekendSelectionKeyboard.DAYS_RU:
-            builder.add(InlineKeyboardButton(text=day_name, callback_data="ignore"))
+        # Добавляем дни недели (нажатие - выходной на каждый такой день)
+        for weekday, day_name in enumerate(WeekendSelectionKeyboard.DAYS_RU):
+            builder.add(InlineKeyboardButton(
+                text=f"✅{day_name}" if weekday_mask & (1 << weekday) else day_name,
+                callback_data=f"weekend_rule_{weekday}_{year}_{month}"
+            ))
         builder.adjust(7)
         
         # Получаем первый день месяца и количество дней
@@ -1,22 +1,64 @@
 import asyncio
 import logging
+import multiprocessing
+from aiohttp import web
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 from config import settings
-from handlers import calendar, doctor_search, profile, registration, schedule, appointments, my_appointments
-from aiogram.fsm.storage.memory import MemoryStorage
+from handlers import calendar, doctor_search, profile, registration, schedule, appointments, my_appointments, admin
+from fsm_storage import SQLiteStorage
+from middlewares.concurrency import UpdateSchedulerMiddleware
+from middlewares.throttling import ThrottlingMiddleware
+from middlewares.idempotency import IdempotencyMiddleware, CallbackAnswerCaptureMiddleware
+from middlewares.metrics import MetricsMiddleware, ApiMetricsMiddleware
+from middlewares.io_accounting import IOAccountingMiddleware, account_storage
+from middlewares.profiling import ProfilingMiddleware
+from metrics import add_metrics_route, start_metrics_server, observe_storage
+from JSONfunctions import storage_observers
+from sharding import create_front_app
 
-storage = MemoryStorage()
- 
-async def main():
+def create_bot() -> Bot:
     bot = Bot(
         token=settings.BOT_TOKEN,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
         ParseMode='HTML',
         timeout=60)
-    
-    dp = Dispatcher()
+    bot.session.middleware(CallbackAnswerCaptureMiddleware())
+    bot.session.middleware(ApiMetricsMiddleware())
+    return bot
+
+def create_dispatcher() -> Dispatcher:
+    storage = SQLiteStorage(settings.FSM_DB_PATH, settings.FSM_TTL)
+    dp = Dispatcher(storage=storage)
+    dp.update.outer_middleware(UpdateSchedulerMiddleware(settings.MAX_CONCURRENT_UPDATES))
+    # Проверка дублей - после очереди пользователя, когда исходное нажатие уже обработано
+    dp.update.outer_middleware(IdempotencyMiddleware(settings.IDEMPOTENCY_WINDOW))
+    # Профилирование по команде администратора /profile N
+    dp.update.outer_middleware(ProfilingMiddleware())
+
+    throttling = ThrottlingMiddleware(
+        navigation_limit=(settings.THROTTLE_NAVIGATION_RATE, settings.THROTTLE_NAVIGATION_BURST),
+        default_limit=(settings.THROTTLE_DEFAULT_RATE, settings.THROTTLE_DEFAULT_BURST)
+    )
+    dp.message.outer_middleware(throttling)
+    dp.callback_query.outer_middleware(throttling)
+
+    # Метрики обработчиков (внутренние middleware знают, какой обработчик выбран) и файлов данных
+    dp.message.middleware(MetricsMiddleware())
+    dp.callback_query.middleware(MetricsMiddleware())
+
+    # Учет чтений/записей файлов данных по апдейтам
+    io_accounting = IOAccountingMiddleware(settings.IO_LOG_THRESHOLD_BYTES)
+    dp.message.middleware(io_accounting)
+    dp.callback_query.middleware(io_accounting)
+
+    for observer in (observe_storage, account_storage):
+        if observer not in storage_observers:
+            storage_observers.append(observer)
+
+    dp.include_router(admin.router)
     dp.include_router(appointments.router)
     dp.include_router(schedule.router)
     dp.include_router(calendar.router)
@@ -24,9 +66,95 @@ async def main():
     dp.include_router(profile.router)
     dp.include_router(registration.router)
     dp.include_router(my_appointments.router)
+    return dp
+
+async def main():
+    bot = create_bot()
+    dp = create_dispatcher()
 
+    if settings.METRICS_PORT:
+        await start_metrics_server(settings.METRICS_HOST, settings.METRICS_PORT)
+
+    await bot.delete_webhook()
     await dp.start_polling(bot)
 
+async def register_webhook(bot: Bot):
+    """Сообщает Telegram адрес вебхука"""
+    await bot.set_webhook(
+        f"{settings.WEBHOOK_URL}{settings.WEBHOOK_PATH}",
+        secret_token=settings.WEBHOOK_SECRET or None,
+        max_connections=min(settings.MAX_CONCURRENT_UPDATES * settings.WORKERS, 100)
+    )
+
+def create_webhook_app(bot: Bot, dp: Dispatcher, set_webhook: bool = True) -> web.Application:
+    """Собирает aiohttp-приложение, принимающее апдейты через вебхук"""
+    if set_webhook:
+        dp.startup.register(register_webhook)
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.WEBHOOK_SECRET or None
+    ).register(app, path=settings.WEBHOOK_PATH)
+    add_metrics_route(app)
+    setup_application(app, dp, bot=bot)
+    return app
+
+def run_webhook():
+    """Запускает бота в режиме вебхука"""
+    bot = create_bot()
+    dp = create_dispatcher()
+    web.run_app(create_webhook_app(bot, dp), host=settings.WEBAPP_HOST, port=settings.WEBAPP_PORT)
+
+def run_worker(index: int):
+    """Процесс-обработчик своей доли апдейтов (слушает только локальный порт)"""
+    logging.basicConfig(level=logging.INFO)
+    bot = create_bot()
+    dp = create_dispatcher()
+    web.run_app(
+        create_webhook_app(bot, dp, set_webhook=False),
+        host="127.0.0.1",
+        port=settings.WORKER_BASE_PORT + index
+    )
+
+def run_sharded():
+    """Запускает WORKERS процессов и входной процесс, распределяющий апдейты по id пользователя"""
+    workers = [
+        multiprocessing.Process(target=run_worker, args=(index,), daemon=True)
+        for index in range(settings.WORKERS)
+    ]
+    for worker in workers:
+        worker.start()
+
+    worker_urls = [
+        f"http://127.0.0.1:{settings.WORKER_BASE_PORT + index}{settings.WEBHOOK_PATH}"
+        for index in range(settings.WORKERS)
+    ]
+    app = create_front_app(settings.WEBHOOK_PATH, settings.WEBHOOK_SECRET, worker_urls)
+
+    bot = create_bot()
+
+    async def on_startup(app: web.Application):
+        await register_webhook(bot)
+
+    async def on_cleanup(app: web.Application):
+        await bot.session.close()
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+
+    try:
+        web.run_app(app, host=settings.WEBAPP_HOST, port=settings.WEBAPP_PORT)
+    finally:
+        for worker in workers:
+            worker.terminate()
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())  
\ No newline at end of file
+    if settings.WEBHOOK_URL and settings.WORKERS > 1:
+        run_sharded()
+    elif settings.WEBHOOK_URL:
+        run_webhook()
+    else:
+        asyncio.run(main())
@@ -0,0 +1,94 @@
+from bisect import bisect_left
+from typing import Dict, Tuple
+from aiohttp import web
+
+# Границы корзин гистограмм задержек (секунд)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Описание метрик: {имя: (тип, описание)}
+METRICS_HELP = {
+    "bot_handler_duration_seconds": ("histogram", "Время работы обработчика"),
+    "bot_handler_errors_total": ("counter", "Исключения в обработчиках"),
+    "bot_updates_in_flight": ("gauge", "Апдейты, обрабатываемые прямо сейчас"),
+    "bot_storage_duration_seconds": ("histogram", "Время чтения/записи JSON-файлов"),
+    "bot_storage_bytes_total": ("counter", "Прочитано/записано байт JSON-файлов"),
+    "bot_api_duration_seconds": ("histogram", "Время запросов к Bot API"),
+    "bot_api_errors_total": ("counter", "Ошибки запросов к Bot API"),
+}
+
+# Значения: {имя: {метки (кортеж пар): значение}}; у гистограмм значение - [счетчики корзин, сумма, количество]
+counters: Dict[str, Dict[Tuple, float]] = {}
+gauges: Dict[str, Dict[Tuple, float]] = {}
+histograms: Dict[str, Dict[Tuple, list]] = {}
+
+def inc_counter(name: str, value: float = 1, **labels) -> None:
+    series = counters.setdefault(name, {})
+    key = tuple(sorted(labels.items()))
+    series[key] = series.get(key, 0) + value
+
+def add_gauge(name: str, value: float, **labels) -> None:
+    series = gauges.setdefault(name, {})
+    key = tuple(sorted(labels.items()))
+    series[key] = series.get(key, 0) + value
+
+def observe(name: str, value: float, **labels) -> None:
+    """Добавляет наблюдение в гистограмму"""
+    series = histograms.setdefault(name, {})
+    key = tuple(sorted(labels.items()))
+    histogram = series.get(key)
+    if histogram is None:
+        histogram = series[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0]
+
+    histogram[0][bisect_left(LATENCY_BUCKETS, value)] += 1
+    histogram[1] += value
+    histogram[2] += 1
+
+def observe_storage(operation: str, filename: str, seconds: float, size: int) -> None:
+    """Наблюдатель операций JSONfunctions"""
+    observe("bot_storage_duration_seconds", seconds, operation=operation, file=filename)
+    inc_counter("bot_storage_bytes_total", size, operation=operation, file=filename)
+
+def format_labels(labels: Tuple) -> str:
+    parts = []
+    for name, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        parts.append(f'{name}="{value}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def render_metrics() -> str:
+    """Все метрики в текстовом формате Prometheus"""
+    lines = []
+    for name, (metric_type, help_text) in METRICS_HELP.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+
+        if metric_type == "histogram":
+            for labels, (buckets, total, count) in histograms.get(name, {}).items():
+                cumulative = 0
+                for bound, bucket_count in zip(LATENCY_BUCKETS + ("+Inf",), buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+        else:
+            series = (counters if metric_type == "counter" else gauges).get(name, {})
+            for labels, value in series.items():
+                lines.append(f"{name}{format_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+async def handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+def add_metrics_route(app: web.Application) -> None:
+    """Добавляет /metrics в aiohttp-приложение"""
+    app.router.add_get("/metrics", handle_metrics)
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Отдельный HTTP-сервер для /metrics (режим polling)"""
+    app = web.Application()
+    add_metrics_route(app)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+class UpdateSchedulerMiddleware(BaseMiddleware):
+    """Обрабатывает апдейты разных пользователей параллельно, а одного пользователя - строго по очереди.
+    Число одновременно выполняемых обработчиков ограничено, остальные апдейты ждут свободного места"""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        # {user_id: [замок пользователя, число апдейтов в работе или в ожидании]}
+        self.user_locks = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            async with self.semaphore:
+                return await handler(event, data)
+
+        entry = self.user_locks.setdefault(user.id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            # asyncio.Lock будит ожидающих в порядке очереди - апдейты пользователя не перемешиваются.
+            # Место в общем лимите занимаем только после своей очереди, чтобы ждущие не держали его
+            async with entry[0]:
+                async with self.semaphore:
+                    return await handler(event, data)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self.user_locks[user.id]
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import AnswerCallbackQuery, TelegramMethod
+from aiogram.types import TelegramObject, Update
+
+# Кнопки, которые меняют данные: их повторное нажатие в пределах окна - дубль.
+# Навигация и переключатели сюда не входят - их повторное нажатие осмысленно.
+# Выбор времени записи тоже не входит: кнопка "🔁 Продолжить запись" повторяет тот же колбэк,
+# а двойную запись на слот и так исключает проверка внутри транзакции
+IDEMPOTENT_PREFIXES = (
+    "delete_appointment_",
+    "move_to_",
+    "pending_apply_",
+    "waitlist_join_",
+    "weekend_confirm",
+)
+
+# Ответ на колбэк, который дал обработчик текущего апдейта: {"text": ..., "show_alert": ...}
+captured_answer: ContextVar[Optional[dict]] = ContextVar("captured_answer", default=None)
+
+class CallbackAnswerCaptureMiddleware(BaseRequestMiddleware):
+    """Запоминает ответ обработчика на колбэк, чтобы повторить его для дубля"""
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot: Bot, method: TelegramMethod):
+        capture = captured_answer.get()
+        if capture is not None and isinstance(method, AnswerCallbackQuery):
+            capture["text"] = method.text
+            capture["show_alert"] = method.show_alert
+        return await make_request(bot, method)
+
+class IdempotencyMiddleware(BaseMiddleware):
+    """Пропускает повторные апдейты и повторные нажатия той же кнопки в течение короткого окна.
+    Дубль нажатия получает сохраненный ответ исходного обработчика, не трогая хранилище"""
+
+    def __init__(self, window: float, max_entries: int = 10000):
+        self.window = window
+        self.max_entries = max_entries
+        # Уже обработанные update_id (повторная доставка вебхука)
+        self.seen_updates = OrderedDict()
+        # {(user_id, callback_data, message_id): (время обработки, ответ)}
+        self.recent_callbacks = OrderedDict()
+
+    def remember(self, cache: OrderedDict, key, value) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        if event.update_id in self.seen_updates:
+            return None
+
+        callback = event.callback_query
+        if callback is None or not (callback.data or "").startswith(IDEMPOTENT_PREFIXES):
+            result = await handler(event, data)
+            # Запоминаем только успешно обработанный апдейт: после ошибки повторная доставка должна пройти
+            self.remember(self.seen_updates, event.update_id, True)
+            return result
+
+        key = (callback.from_user.id, callback.data, callback.message.message_id if callback.message else None)
+        now = time.monotonic()
+
+        recent = self.recent_callbacks.get(key)
+        if recent and now - recent[0] < self.window:
+            answer = recent[1]
+            await callback.answer(answer.get("text"), show_alert=answer.get("show_alert"))
+            return None
+
+        capture = {}
+        token = captured_answer.set(capture)
+        try:
+            result = await handler(event, data)
+        finally:
+            captured_answer.reset(token)
+
+        self.remember(self.seen_updates, event.update_id, True)
+        self.remember(self.recent_callbacks, key, (time.monotonic(), capture))
+        return result
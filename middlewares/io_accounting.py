@@ -0,0 +1,60 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+# Учет работы с файлами данных текущего апдейта: {"load"/"save": {filename: [операций, байт, секунд]}}
+current_io: ContextVar[Optional[dict]] = ContextVar("current_io", default=None)
+
+def account_storage(operation: str, filename: str, seconds: float, size: int) -> None:
+    """Наблюдатель операций JSONfunctions: относит операцию к текущему апдейту"""
+    io = current_io.get()
+    if io is None:
+        return
+
+    totals = io[operation].setdefault(filename, [0, 0, 0.0])
+    totals[0] += 1
+    totals[1] += size
+    totals[2] += seconds
+
+def format_io(files: dict) -> str:
+    return ", ".join(
+        f"{filename}×{count} ({size // 1024} КБ, {seconds * 1000:.1f} мс)"
+        for filename, (count, size, seconds) in files.items()
+    ) or "-"
+
+class IOAccountingMiddleware(BaseMiddleware):
+    """Пишет в лог сводку чтений/записей файлов данных для апдейтов, превысивших порог"""
+
+    def __init__(self, threshold_bytes: int):
+        self.threshold_bytes = threshold_bytes
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        io = {"load": {}, "save": {}}
+        token = current_io.set(io)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            current_io.reset(token)
+
+            total_bytes = sum(size for files in io.values() for _, size, _ in files.values())
+            if total_bytes >= self.threshold_bytes:
+                callback = getattr(data.get("handler"), "callback", None)
+                event_update = data.get("event_update")
+                logging.warning(
+                    "Тяжелый апдейт %s (%s): %.1f мс, %d КБ; чтение: %s; запись: %s",
+                    getattr(event_update, "update_id", "?"),
+                    callback.__name__ if callback else "unknown",
+                    (time.perf_counter() - started) * 1000,
+                    total_bytes // 1024,
+                    format_io(io["load"]),
+                    format_io(io["save"])
+                )
@@ -0,0 +1,45 @@
+import time
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.types import TelegramObject
+from metrics import observe, inc_counter, add_gauge
+
+class MetricsMiddleware(BaseMiddleware):
+    """Время работы, ошибки и число выполняемых сейчас вызовов каждого обработчика"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get("handler")
+        callback = getattr(handler_object, "callback", None)
+        name = f"{callback.__module__}.{callback.__name__}" if callback else "unknown"
+
+        add_gauge("bot_updates_in_flight", 1, handler=name)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            inc_counter("bot_handler_errors_total", handler=name)
+            raise
+        finally:
+            observe("bot_handler_duration_seconds", time.perf_counter() - started, handler=name)
+            add_gauge("bot_updates_in_flight", -1, handler=name)
+
+class ApiMetricsMiddleware(BaseRequestMiddleware):
+    """Время и ошибки запросов к Bot API по методам"""
+
+    async def __call__(self, make_request: NextRequestMiddlewareType, bot: Bot, method: TelegramMethod):
+        name = type(method).__name__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception:
+            inc_counter("bot_api_errors_total", method=name)
+            raise
+        finally:
+            observe("bot_api_duration_seconds", time.perf_counter() - started, method=name)
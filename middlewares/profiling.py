@@ -0,0 +1,134 @@
+import asyncio
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+from aiogram import BaseMiddleware, Bot
+from aiogram.types import TelegramObject, Update, BufferedInputFile
+
+# Сколько строк статистики попадает в текстовый отчет
+REPORT_LINES = 40
+
+# Файл .prof больше этого размера не отправляется - только текстовая сводка
+MAX_PROFILE_BYTES = 20 * 1024 * 1024
+
+# Текущий сеанс профилирования (один на процесс):
+# {"chat_id", "remaining", "profiler", "snapshot", "lock"}
+profiling_session: Optional[dict] = None
+
+def start_profiling(chat_id: int, updates: int) -> bool:
+    """Включает профилирование следующих updates апдейтов. Возвращает False, если сеанс уже идет"""
+    global profiling_session
+
+    if profiling_session is not None:
+        return False
+
+    tracemalloc.start(25)
+    profiling_session = {
+        "chat_id": chat_id,
+        "remaining": updates,
+        "profiler": cProfile.Profile(),
+        "snapshot": tracemalloc.take_snapshot(),
+        "lock": asyncio.Lock()
+    }
+    return True
+
+def build_reports(session: dict) -> tuple:
+    """Возвращает (.prof для snakeviz/flameprof, текстовый отчет)"""
+    profiler = session["profiler"]
+
+    fd, path = tempfile.mkstemp(suffix=".prof")
+    os.close(fd)
+    try:
+        profiler.dump_stats(path)
+        with open(path, "rb") as file:
+            prof_data = file.read()
+    finally:
+        os.unlink(path)
+
+    report = io.StringIO()
+    report.write("=== cProfile: по суммарному времени ===\n")
+    pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(REPORT_LINES)
+    report.write("\n=== cProfile: по собственному времени ===\n")
+    pstats.Stats(profiler, stream=report).sort_stats("tottime").print_stats(REPORT_LINES)
+
+    report.write("\n=== tracemalloc: прирост памяти за сеанс ===\n")
+    for stat in tracemalloc.take_snapshot().compare_to(session["snapshot"], "lineno")[:REPORT_LINES]:
+        report.write(f"{stat}\n")
+    current, peak = tracemalloc.get_traced_memory()
+    report.write(f"\nСейчас: {current / 1024 / 1024:.1f} МБ, пик: {peak / 1024 / 1024:.1f} МБ\n")
+
+    return prof_data, report.getvalue().encode("utf-8")
+
+async def finish_profiling(bot: Bot) -> None:
+    """Завершает сеанс и отправляет отчеты администратору"""
+    global profiling_session
+
+    session, profiling_session = profiling_session, None
+    try:
+        prof_data, report = build_reports(session)
+    finally:
+        tracemalloc.stop()
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    try:
+        if len(prof_data) <= MAX_PROFILE_BYTES:
+            await bot.send_document(
+                session["chat_id"],
+                BufferedInputFile(prof_data, filename=f"profile_{stamp}.prof"),
+                caption="📈 Профиль cProfile (snakeviz, flameprof)"
+            )
+        else:
+            await bot.send_message(
+                session["chat_id"],
+                f"Файл профиля слишком большой ({len(prof_data) // 1024 // 1024} МБ), отправляю только сводку"
+            )
+        await bot.send_document(
+            session["chat_id"],
+            BufferedInputFile(report, filename=f"profile_{stamp}.txt"),
+            caption="📄 Сводка: горячие функции и прирост памяти"
+        )
+    except Exception as e:
+        logging.warning("Не удалось отправить отчет профилирования: %s", e)
+
+class ProfilingMiddleware(BaseMiddleware):
+    """Профилирует апдейты, пока идет сеанс, включенный администратором.
+    cProfile записывает все, что выполняется в потоке цикла событий, поэтому на время сеанса апдейты
+    обрабатываются по одному: в профиль попадают только запрошенные апдейты. Фоновые задачи
+    (рассылка уведомлений, отложенные правки), работающие в это время, в профиль тоже попадают"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        session = profiling_session
+        if session is None or session["remaining"] <= 0:
+            return await handler(event, data)
+
+        try:
+            async with session["lock"]:
+                # Сеанс мог закончиться, пока апдейт ждал своей очереди
+                if profiling_session is not session or session["remaining"] <= 0:
+                    session = None
+                else:
+                    session["remaining"] -= 1
+                    session["profiler"].enable()
+                    try:
+                        result = await handler(event, data)
+                    finally:
+                        session["profiler"].disable()
+        finally:
+            # Отчет отправляется уже без блокировки, чтобы ожидающие апдейты не стояли за ним
+            if session is not None and session["remaining"] <= 0 and profiling_session is session:
+                await finish_profiling(data["bot"])
+
+        if session is None:
+            return await handler(event, data)
+        return result
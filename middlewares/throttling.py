@@ -0,0 +1,65 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, CallbackQuery
+
+# Семейства колбэков с отдельным лимитом: листание календарей перечитывает файлы и перерисовывает сообщение.
+# Более длинные префиксы - раньше коротких
+NAVIGATION_PREFIXES = (
+    "doctor_calendar_nav_",
+    "calendar_nav_",
+    "weekend_nav_",
+    "appointments_next",
+    "appointments_prev",
+)
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Ограничивает частоту действий пользователя по алгоритму token bucket отдельно для каждого семейства"""
+
+    def __init__(self, navigation_limit: Tuple[float, int], default_limit: Tuple[float, int], max_buckets: int = 10000):
+        # Лимит: (пополнение токенов в секунду, емкость корзины)
+        self.limits = {"navigation": navigation_limit, "default": default_limit}
+        self.max_buckets = max_buckets
+        # {(user_id, семейство): (токены, время последнего пополнения)} в порядке последнего обращения
+        self.buckets = OrderedDict()
+
+    @staticmethod
+    def get_family(event: TelegramObject) -> str:
+        """Определяет семейство действия"""
+        if isinstance(event, CallbackQuery) and (event.data or "").startswith(NAVIGATION_PREFIXES):
+            return "navigation"
+        return "default"
+
+    def consume(self, user_id: int, family: str) -> bool:
+        """Списывает токен. Возвращает False, если токенов не осталось"""
+        rate, capacity = self.limits[family]
+        now = time.monotonic()
+        key = (user_id, family)
+
+        tokens, updated_at = self.buckets.pop(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+
+        # Давно не использованные корзины вытесняются: через пару секунд простоя они все равно полные
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_buckets:
+            self.buckets.popitem(last=False)
+
+        return allowed
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None or self.consume(user.id, self.get_family(event)):
+            return await handler(event, data)
+
+        # Лишнее нажатие отвечаем без чтения файлов и перерисовки, лишние сообщения просто пропускаем
+        if isinstance(event, CallbackQuery):
+            await event.answer("⏳ Слишком часто, подождите немного")
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
+from aiogram.exceptions import TelegramRetryAfter
+
+# Не больше 25 сообщений в секунду (общий лимит Telegram - около 30)
+NOTIFICATIONS_PER_SECOND = 25
+
+# Очередь пачек уведомлений и фоновая задача, которая их отправляет
+notification_queue: Optional[asyncio.Queue] = None
+notification_worker: Optional[asyncio.Task] = None
+
+def enqueue_notifications(bot: Bot, messages: List[Tuple]) -> None:
+    """Ставит пачку уведомлений [(chat_id, текст[, клавиатура])] в очередь на фоновую отправку"""
+    global notification_queue, notification_worker
+
+    if not messages:
+        return
+
+    if notification_queue is None:
+        notification_queue = asyncio.Queue()
+
+    if notification_worker is None or notification_worker.done():
+        notification_worker = asyncio.create_task(process_notifications())
+
+    notification_queue.put_nowait((bot, messages))
+
+async def process_notifications():
+    """Отправляет уведомления из очереди с ограничением скорости"""
+    while True:
+        bot, messages = await notification_queue.get()
+        try:
+            for chat_id, text, *markup in messages:
+                await send_notification(bot, chat_id, text, *markup)
+                await asyncio.sleep(1 / NOTIFICATIONS_PER_SECOND)
+        finally:
+            notification_queue.task_done()
+
+async def send_notification(bot: Bot, chat_id: int, text: str,
+                            reply_markup: Optional[InlineKeyboardMarkup] = None) -> bool:
+    """Отправляет одно уведомление, повторяя попытку после flood wait"""
+    for _ in range(2):
+        try:
+            await bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup)
+            return True
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+        except Exception as e:
+            logging.warning("Ошибка отправки уведомления пользователю %s: %s", chat_id, e)
+            return False
+    return False
@@ -0,0 +1,128 @@
+from JSONfunctions import load_json_data, get_data_version
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+
+# Поля шаблона приема. Плоские поля расписания - базовый шаблон для всех дней,
+# "weekdays" ({"0".."6": шаблон или None}) переопределяет его по дням недели,
+# "exceptions" ({"ГГГГ-ММ-ДД": шаблон или None}) - для конкретных дат.
+# None означает, что приема в этот день нет. Недостающие поля берутся из базового шаблона.
+TEMPLATE_FIELDS = ("patient_time", "primary_start", "primary_end", "repeat_start", "repeat_end")
+
+APPOINTMENT_TYPES = ("primary", "repeat")
+
+# Слот: (начало в минутах, конец в минутах, подпись "ЧЧ:ММ-ЧЧ:ММ")
+Slot = Tuple[int, int, str]
+
+# Кэш скомпилированных расписаний: {doctor_id: CompiledSchedule}
+compiled_schedules_cache = {}
+
+def parse_minutes(time_str: str) -> int:
+    """Переводит время в формате ЧЧ:ММ в минуты от начала суток"""
+    hours, minutes = map(int, time_str.split(':'))
+    return hours * 60 + minutes
+
+def format_minutes(total: int) -> str:
+    """Переводит минуты от начала суток в формат ЧЧ:ММ"""
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+def compile_period(start_time: Optional[str], end_time: Optional[str], patient_time: int) -> List[Slot]:
+    """Разбивает период приема на слоты длиной patient_time минут"""
+    if not start_time or not end_time or not patient_time:
+        return []
+
+    start_total = parse_minutes(start_time)
+    end_total = parse_minutes(end_time)
+
+    slots = []
+    current = start_total
+    while current + patient_time <= end_total:
+        end = current + patient_time
+        slots.append((current, end, f"{format_minutes(current)}-{format_minutes(end)}"))
+        current = end
+
+    return slots
+
+def compile_template(base: dict, template: Optional[dict]) -> Dict[str, List[Slot]]:
+    """Компилирует шаблон дня в слоты по типам приема"""
+    if template is None:
+        template = {f"{appointment_type}_start": None for appointment_type in APPOINTMENT_TYPES}
+
+    fields = {field: template.get(field, base.get(field)) for field in TEMPLATE_FIELDS}
+    patient_time = int(fields["patient_time"] or 0)
+
+    slots = {
+        appointment_type: compile_period(
+            fields[f"{appointment_type}_start"],
+            fields[f"{appointment_type}_end"],
+            patient_time
+        )
+        for appointment_type in APPOINTMENT_TYPES
+    }
+    # Все слоты дня по времени - для просмотра записей врача
+    slots["all"] = sorted(slots["primary"] + slots["repeat"])
+    return slots
+
+class CompiledSchedule:
+    """Расписание врача, заранее разложенное на слоты по дням недели и датам-исключениям"""
+
+    def __init__(self, schedule: dict):
+        self.version = schedule.get("version", 0)
+        # Версия файла расписаний, из которого прочитано расписание (None - передано напрямую)
+        self.data_version = None
+        weekdays = schedule.get("weekdays", {})
+
+        self.weekday_slots = []
+        for weekday in range(7):
+            template = weekdays.get(str(weekday), schedule)
+            self.weekday_slots.append(compile_template(schedule, template))
+
+        self.exception_slots = {
+            date_str: compile_template(schedule, template)
+            for date_str, template in schedule.get("exceptions", {}).items()
+        }
+
+    def day_slots(self, day: date) -> Dict[str, List[Slot]]:
+        """Возвращает слоты дня по типам приема"""
+        return self.exception_slots.get(day.isoformat()) or self.weekday_slots[day.weekday()]
+
+    def slots_for(self, day: date, appointment_type: Optional[str] = None) -> List[Slot]:
+        """Возвращает слоты дня (одного типа приема или всех, отсортированные по времени)"""
+        return self.day_slots(day).get(appointment_type or "all", [])
+
+    def is_working_day(self, day: date) -> bool:
+        """Проверяет, есть ли в этот день прием по расписанию"""
+        return bool(self.day_slots(day)["all"])
+
+def get_compiled_schedule(doctor_id, schedule: Optional[dict] = None,
+                          version: Optional[int] = None) -> Optional[CompiledSchedule]:
+    """Возвращает скомпилированное расписание врача (компиляция - один раз на версию расписания)"""
+    data_version = None
+    if schedule is None:
+        # Известна версия, она уже в кэше и файл расписаний с тех пор не менялся (в том числе другим процессом) -
+        # файл можно не читать
+        data_version = get_data_version('schedules')
+        cached = compiled_schedules_cache.get(str(doctor_id))
+        if (cached and version is not None and cached.version == version
+                and data_version is not None and cached.data_version == data_version):
+            return cached
+        
+        schedules_data = load_json_data('schedules')
+        schedule = schedules_data.get("doctors", {}).get(str(doctor_id), {})
+
+    if not schedule:
+        return None
+
+    cached = compiled_schedules_cache.get(str(doctor_id))
+    if cached and cached.version == schedule.get("version", 0):
+        if data_version is not None:
+            cached.data_version = data_version
+        return cached
+
+    compiled = CompiledSchedule(schedule)
+    compiled.data_version = data_version
+    compiled_schedules_cache[str(doctor_id)] = compiled
+    return compiled
+
+def invalidate_compiled_schedule(doctor_id) -> None:
+    """Сбрасывает скомпилированное расписание врача после его изменения"""
+    compiled_schedules_cache.pop(str(doctor_id), None)
@@ -0,0 +1,63 @@
+import json
+import logging
+from typing import List
+from aiohttp import web, ClientSession, ClientError
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+def jump_consistent_hash(key: int, buckets: int) -> int:
+    """Jump consistent hash (Lamping, Veach): при добавлении процесса переезжает лишь 1/N ключей"""
+    key &= 0xFFFFFFFFFFFFFFFF
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        jump = int((bucket + 1) * (1 << 31) / ((key >> 33) + 1))
+    return bucket
+
+def get_shard_key(update: dict) -> int:
+    """Ключ шардирования апдейта - id пользователя: все его апдейты (и его FSM-состояние) живут в одном процессе.
+    Данные врачей согласуются между процессами блокировками файлов и версиями кэшей"""
+    for value in update.values():
+        if isinstance(value, dict) and "from" in value:
+            return value["from"]["id"]
+
+    return update.get("update_id", 0)
+
+def create_front_app(path: str, secret: str, worker_urls: List[str]) -> web.Application:
+    """Входной процесс: принимает вебхук и пересылает апдейт процессу-владельцу"""
+    app = web.Application()
+
+    async def on_startup(app: web.Application):
+        app["session"] = ClientSession()
+
+    async def on_cleanup(app: web.Application):
+        await app["session"].close()
+
+    async def handle_update(request: web.Request) -> web.Response:
+        if secret and request.headers.get(SECRET_HEADER) != secret:
+            return web.Response(status=401)
+
+        body = await request.read()
+        try:
+            update = json.loads(body)
+        except ValueError:
+            return web.Response(status=400)
+
+        worker_url = worker_urls[jump_consistent_hash(get_shard_key(update), len(worker_urls))]
+        headers = {"Content-Type": "application/json"}
+        if secret:
+            headers[SECRET_HEADER] = secret
+
+        try:
+            async with app["session"].post(worker_url, data=body, headers=headers) as response:
+                # Ошибка процесса - Telegram повторит доставку апдейта
+                return web.Response(status=response.status)
+        except ClientError as e:
+            logging.warning("Процесс %s недоступен: %s", worker_url, e)
+            return web.Response(status=503)
+
+    app.on_startup.append(on_startup)
+    app.on_cleanup.append(on_cleanup)
+    app.router.add_post(path, handle_update)
+    return app
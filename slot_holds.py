@@ -0,0 +1,68 @@
+import heapq
+import time
+from typing import Optional, Set
+
+# Сколько секунд слот закреплен за пациентом, пока он дозаполняет данные
+HOLD_TTL_SECONDS = 600
+
+# Временные брони слотов: {(doctor_id, "ГГГГ-ММ-ДД"): {"ЧЧ:ММ-ЧЧ:ММ": (patient_id, время истечения)}}
+slot_holds = {}
+
+# Куча сроков истечения: (время истечения, doctor_id, дата, слот).
+# Продленные или снятые брони остаются в куче и пропускаются при очистке
+hold_expirations = []
+
+def purge_expired_holds(now: Optional[float] = None) -> None:
+    """Снимает все брони с истекшим сроком"""
+    now = time.monotonic() if now is None else now
+
+    while hold_expirations and hold_expirations[0][0] <= now:
+        _, doctor_id, date_str, time_slot = heapq.heappop(hold_expirations)
+        day_holds = slot_holds.get((doctor_id, date_str))
+        if not day_holds:
+            continue
+
+        hold = day_holds.get(time_slot)
+        if hold and hold[1] <= now:
+            del day_holds[time_slot]
+            if not day_holds:
+                del slot_holds[(doctor_id, date_str)]
+
+def hold_slot(doctor_id, date_str: str, time_slot: str, patient_id, ttl: int = HOLD_TTL_SECONDS) -> bool:
+    """Закрепляет слот за пациентом на ttl секунд. Возвращает False, если слот держит другой пациент"""
+    purge_expired_holds()
+    day_holds = slot_holds.setdefault((str(doctor_id), date_str), {})
+
+    hold = day_holds.get(time_slot)
+    if hold and hold[0] != str(patient_id):
+        return False
+
+    expires_at = time.monotonic() + ttl
+    day_holds[time_slot] = (str(patient_id), expires_at)
+    heapq.heappush(hold_expirations, (expires_at, str(doctor_id), date_str, time_slot))
+    return True
+
+def release_slot(doctor_id, date_str: str, time_slot: str, patient_id=None) -> None:
+    """Снимает бронь слота (если указан patient_id - только его собственную)"""
+    day_holds = slot_holds.get((str(doctor_id), date_str))
+    if not day_holds:
+        return
+
+    hold = day_holds.get(time_slot)
+    if hold and (patient_id is None or hold[0] == str(patient_id)):
+        del day_holds[time_slot]
+        if not day_holds:
+            del slot_holds[(str(doctor_id), date_str)]
+
+def get_held_slots(doctor_id, date_str: str, except_patient_id=None) -> Set[str]:
+    """Возвращает слоты дня, которые сейчас держат другие пациенты"""
+    purge_expired_holds()
+    day_holds = slot_holds.get((str(doctor_id), date_str), {})
+    return {
+        time_slot for time_slot, (patient_id, _) in day_holds.items()
+        if patient_id != str(except_patient_id)
+    }
+
+def is_held_by_other(doctor_id, date_str: str, time_slot: str, patient_id) -> bool:
+    """Проверяет, держит ли слот другой пациент"""
+    return time_slot in get_held_slots(doctor_id, date_str, patient_id)
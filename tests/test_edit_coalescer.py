@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("aiogram")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+import edit_coalescer
+
+class Screen:
+    """Сообщение в чате: то, что сейчас видит пользователь"""
+
+    def __init__(self):
+        self.text = None
+        self.reply_markup = None
+        self.edits = 0
+
+    def snapshot(self):
+        """Сообщение из очередного колбэка - с содержимым на момент нажатия"""
+        async def edit_text(text, reply_markup=None):
+            self.text, self.reply_markup = text, reply_markup
+            self.edits += 1
+
+        return SimpleNamespace(
+            chat=SimpleNamespace(id=1),
+            message_id=10,
+            text=self.text,
+            reply_markup=self.reply_markup,
+            edit_text=edit_text
+        )
+
+def month_markup(month: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(inline_keyboard=[[
+        InlineKeyboardButton(text=month, callback_data=f"weekend_nav_{month}")
+    ]])
+
+async def press_next(screen: Screen, month: str):
+    """Нажатие ▶️: правка через очередь и ожидание ее отправки"""
+    edit_coalescer.schedule_edit(screen.snapshot(), month, month_markup(month))
+    await asyncio.gather(*edit_coalescer.edit_tasks.values())
+
+def test_edit_after_direct_edits_of_same_message(monkeypatch):
+    monkeypatch.setattr(edit_coalescer, "EDIT_DEBOUNCE_SECONDS", 0)
+
+    async def scenario():
+        screen = Screen()
+
+        # Открыть выбор выходных на месяце A (прямая правка)
+        await screen.snapshot().edit_text("A", reply_markup=month_markup("A"))
+        # ▶️ - очередь отправляет B
+        await press_next(screen, "B")
+        assert screen.text == "B"
+
+        # Выход в меню и повторное открытие на A - прямые правки в обход очереди
+        await screen.snapshot().edit_text("Меню")
+        await screen.snapshot().edit_text("A", reply_markup=month_markup("A"))
+
+        # ▶️ снова - сообщение должно переключиться на B
+        await press_next(screen, "B")
+        assert screen.text == "B"
+        assert screen.reply_markup == month_markup("B")
+
+    asyncio.run(scenario())
+
+def test_direct_edit_cancels_pending_edit(monkeypatch):
+    monkeypatch.setattr(edit_coalescer, "EDIT_DEBOUNCE_SECONDS", 0.01)
+
+    async def scenario():
+        screen = Screen()
+        await screen.snapshot().edit_text("A", reply_markup=month_markup("A"))
+
+        # ▶️ и сразу подтверждение: отложенный календарь не должен перезаписать результат
+        edit_coalescer.schedule_edit(screen.snapshot(), "B", month_markup("B"))
+        await edit_coalescer.edit_now(screen.snapshot(), "Сохранено")
+        await asyncio.sleep(0.05)
+        assert screen.text == "Сохранено"
+
+        # ▶️ и сразу выход в меню в обход очереди
+        edit_coalescer.schedule_edit(screen.snapshot(), "B", month_markup("B"))
+        edit_coalescer.cancel_edit(screen.snapshot())
+        await screen.snapshot().edit_text("Меню")
+        await asyncio.sleep(0.05)
+        assert screen.text == "Меню"
+        assert not edit_coalescer.edit_tasks
+
+    asyncio.run(scenario())
+
+def test_unchanged_edit_is_skipped(monkeypatch):
+    monkeypatch.setattr(edit_coalescer, "EDIT_DEBOUNCE_SECONDS", 0)
+
+    async def scenario():
+        screen = Screen()
+        await screen.snapshot().edit_text("B", reply_markup=month_markup("B"))
+
+        await press_next(screen, "B")
+        assert screen.edits == 1
+
+    asyncio.run(scenario())
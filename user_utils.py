@@ -1,8 +1,19 @@
-from JSONfunctions import load_json_data, save_json_data
+from JSONfunctions import load_json_data, json_transaction, get_data_version
+from schedule_model import get_compiled_schedule, invalidate_compiled_schedule
+from weekend_rules import rules_from_user, rules_to_user, days_off_in_month, days_off_between
+from view_cache import invalidate_views
 from typing import Dict, Any, Optional
+from datetime import date, timedelta
 
 temp_weekends_storage = {}
 
+# На сколько дней вперед и назад от сегодня строится календарь рабочих дней
+WORKING_DAYS_HORIZON = 365
+
+# Кэш рабочих дней врачей: {doctor_id: (ключ актуальности, отсортированный список дат)}.
+# В ключ входят версии users.json и schedules.json - кэш сбрасывается и после записи другим процессом
+working_days_cache = {}
+
 def is_user_registered(user_id: int) -> bool:
     """Проверяет, зарегистрирован ли пользователь"""
     users_data = load_json_data('users')
@@ -13,19 +24,32 @@ def get_user_data(user_id: int) -> Optional[Dict[str, Any]]:
     users_data = load_json_data('users')
     return users_data["users"].get(str(user_id))
 
-def get_doctor_weekends(user_id: int) -> set:
-    """Получает сохраненные выходные дни врача из JSON"""
+def get_users_data(user_ids) -> Dict[str, Dict[str, Any]]:
+    """Возвращает данные нескольких пользователей за одно чтение users.json"""
+    users = load_json_data('users')["users"]
+    result = {}
+    for user_id in user_ids:
+        user_data = users.get(str(user_id))
+        if user_data:
+            result[str(user_id)] = user_data
+    return result
+
+def get_doctor_weekend_rules(user_id: int) -> dict:
+    """Получает правила выходных врача из JSON"""
     users_data = load_json_data('users')
     user_data = users_data["users"].get(str(user_id), {})
-    weekends = user_data.get("weekends", [])
-    return set(weekends)
+    return rules_from_user(user_data)
 
-def save_doctor_weekends(user_id: int, weekends: set):
-    """Сохраняет выходные дни врача в JSON"""
-    users_data = load_json_data('users')
-    if str(user_id) in users_data["users"]:
-        users_data["users"][str(user_id)]["weekends"] = list(weekends)
-        save_json_data(users_data, 'users')
+def get_doctor_days_off(user_id: int, year: int, month: int) -> set:
+    """Возвращает выходные дни врача за месяц (ISO-даты), вычисленные по правилам"""
+    return days_off_in_month(get_doctor_weekend_rules(user_id), year, month)
+
+def save_doctor_weekends(user_id: int, rules: dict):
+    """Сохраняет правила выходных врача в JSON"""
+    with json_transaction('users') as users_data:
+        if str(user_id) in users_data["users"]:
+            users_data["users"][str(user_id)].update(rules_to_user(rules))
+    invalidate_working_days(user_id)
 
 def find_doctors_by_query(query: str) -> list:
     """Ищет врачей по ФИО, адресу или специальности"""
@@ -66,13 +90,19 @@ def get_short_name(full_name: str) -> str:
     
 def save_doctor_schedule(user_id: str, schedule_data: dict):
     """Сохраняет расписание врача в JSON"""
-    schedules_data = load_json_data('schedules')
-    
-    if "doctors" not in schedules_data:
-        schedules_data["doctors"] = {}
-    
-    schedules_data["doctors"][user_id] = schedule_data
-    save_json_data(schedules_data, 'schedules')
+    with json_transaction('schedules') as schedules_data:
+        if "doctors" not in schedules_data:
+            schedules_data["doctors"] = {}
+        
+        # Версия расписания нужна для кэша скомпилированных слотов
+        previous_schedule = schedules_data["doctors"].get(str(user_id), {})
+        schedule_data["version"] = previous_schedule.get("version", 0) + 1
+        
+        # Обновляем только переданные поля: шаблоны "weekdays"/"exceptions" сохраняются
+        schedules_data["doctors"][str(user_id)] = {**previous_schedule, **schedule_data}
+    invalidate_compiled_schedule(user_id)
+    invalidate_working_days(user_id)
+    invalidate_views(user_id)
 
 def get_doctor_schedule(user_id: str) -> dict:
     """Получает расписание врача из JSON"""
@@ -89,6 +119,34 @@ def get_doctor_schedule(doctor_id: int) -> dict:
     schedules_data = load_json_data('schedules')
     return schedules_data.get("doctors", {}).get(str(doctor_id), {})
 
+def get_doctor_working_days(doctor_id: int) -> list:
+    """Возвращает отсортированный список рабочих дней врача с учетом расписания и выходных"""
+    today = date.today()
+    cache_key = (today, get_data_version('users'), get_data_version('schedules'))
+    cached = working_days_cache.get(str(doctor_id))
+    if cached and cached[0] == cache_key:
+        return cached[1]
+    
+    working_days = []
+    
+    # Без расписания у врача нет рабочих дней
+    compiled_schedule = get_compiled_schedule(doctor_id)
+    if compiled_schedule:
+        rules = get_doctor_weekend_rules(doctor_id)
+        first_day = today - timedelta(days=WORKING_DAYS_HORIZON)
+        days_off = days_off_between(rules, first_day, today + timedelta(days=WORKING_DAYS_HORIZON))
+        for i in range(2 * WORKING_DAYS_HORIZON + 1):
+            day = first_day + timedelta(days=i)
+            if day.isoformat() not in days_off and compiled_schedule.is_working_day(day):
+                working_days.append(day)
+    
+    working_days_cache[str(doctor_id)] = (cache_key, working_days)
+    return working_days
+
+def invalidate_working_days(doctor_id) -> None:
+    """Сбрасывает кэш рабочих дней врача после изменения расписания или выходных"""
+    working_days_cache.pop(str(doctor_id), None)
+
 def get_month_name(month: int) -> str:
     """Возвращает название месяца на русском"""
     months = [
@@ -0,0 +1,24 @@
+from typing import Optional
+
+VIEWS = ("profile", "doctor_card")
+
+# Готовые тексты представлений пользователя: {(вид, user_id): (версия, текст)}.
+# Версию задает вызывающий код: для карточки врача - версия записи, для профиля - версия users.json и имя
+rendered_views = {}
+
+def get_cached_view(view: str, user_id, version) -> Optional[str]:
+    """Возвращает готовый текст, если он построен для этой же версии данных"""
+    entry = rendered_views.get((view, str(user_id)))
+    if entry and entry[0] == version:
+        return entry[1]
+    return None
+
+def store_view(view: str, user_id, version, text: str) -> str:
+    """Запоминает построенный текст и возвращает его"""
+    rendered_views[(view, str(user_id))] = (version, text)
+    return text
+
+def invalidate_views(user_id) -> None:
+    """Сбрасывает все готовые тексты пользователя после изменения его данных"""
+    for view in VIEWS:
+        rendered_views.pop((view, str(user_id)), None)
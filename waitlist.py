@@ -0,0 +1,79 @@
+from JSONfunctions import load_json_data, json_transaction
+from notifications import enqueue_notifications
+from user_utils import get_month_name
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from datetime import date
+from typing import List
+
+def get_waitlist(doctor_id, date_str: str) -> List[str]:
+    """Возвращает пациентов, ожидающих освобождения слота у врача на дату"""
+    waitlist_data = load_json_data('waitlist')
+    return waitlist_data.get("doctors", {}).get(str(doctor_id), {}).get(date_str, [])
+
+def join_waitlist(doctor_id, date_str: str, patient_id) -> bool:
+    """Добавляет пациента в лист ожидания дня. Возвращает False, если он уже там"""
+    with json_transaction('waitlist') as waitlist_data:
+        doctor_days = waitlist_data.setdefault("doctors", {}).setdefault(str(doctor_id), {})
+        patients = doctor_days.setdefault(date_str, [])
+        
+        if str(patient_id) in patients:
+            return False
+        
+        patients.append(str(patient_id))
+        
+        # Заодно убираем прошедшие дни врача, чтобы файл не рос
+        today = date.today().isoformat()
+        for day in [day for day in doctor_days if day < today]:
+            del doctor_days[day]
+    
+    return True
+
+def leave_waitlist(doctor_id, date_str: str, patient_id) -> None:
+    """Убирает пациента из листа ожидания дня"""
+    with json_transaction('waitlist') as waitlist_data:
+        doctor_days = waitlist_data.get("doctors", {}).get(str(doctor_id), {})
+        patients = doctor_days.get(date_str, [])
+        
+        if str(patient_id) in patients:
+            patients.remove(str(patient_id))
+            if not patients:
+                del doctor_days[date_str]
+
+def build_slot_released_messages(appointments: List[dict]) -> List[tuple]:
+    """Формирует уведомления листа ожидания об освободившихся слотах (одно чтение файла на пачку)"""
+    today = date.today().isoformat()
+    waitlists = load_json_data('waitlist').get("doctors", {})
+    
+    messages = []
+    for appointment in appointments:
+        if appointment["date"] < today:
+            continue
+        
+        patients = [
+            patient_id
+            for patient_id in waitlists.get(appointment["doctor_id"], {}).get(appointment["date"], [])
+            if patient_id != appointment["patient_id"]
+        ]
+        if not patients:
+            continue
+        
+        released_date = date.fromisoformat(appointment["date"])
+        appointment_type = appointment["appointment_type"]
+        text = (f"🔔 Освободилось время {appointment['time_slot']} на "
+                f"{released_date.day} {get_month_name(released_date.month)} {released_date.year}.\n"
+                f"Успейте записаться!")
+        
+        # Кнопка сразу открывает свободные слоты нужного типа приема
+        markup = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(
+            text="📅 Записаться",
+            callback_data=(f"appointment_{appointment_type}_{appointment['doctor_id']}_"
+                           f"{released_date.year}_{released_date.month}_{released_date.day}")
+        )]])
+        
+        messages.extend((int(patient_id), text, markup) for patient_id in patients)
+    
+    return messages
+
+def publish_slot_released(bot, appointment: dict) -> None:
+    """Событие освобождения слота: рассылает уведомление всем из листа ожидания этого дня"""
+    enqueue_notifications(bot, build_slot_released_messages([appointment]))
@@ -0,0 +1,103 @@
+# Локальная проверка режима вебхука: отправляет синтетические апдейты на запущенный сервер.
+# Пример: python webhook_harness.py --url http://127.0.0.1:8080/webhook --secret <WEBHOOK_SECRET> --count 500
+# Ответы бота уходят в Bot API, поэтому здесь важны только коды ответа вебхука и время приема.
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from aiohttp import ClientSession
+
+update_ids = itertools.count(1)
+
+def make_message_update(user_id: int, text: str) -> dict:
+    """Синтетический апдейт с текстовым сообщением"""
+    update_id = next(update_ids)
+    user = {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": user,
+            "text": text
+        }
+    }
+
+def make_callback_update(user_id: int, data: str) -> dict:
+    """Синтетический апдейт с нажатием inline-кнопки"""
+    update_id = next(update_ids)
+    user = {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": user,
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": {
+                "message_id": 1,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": 1, "is_bot": True, "first_name": "Bot"},
+                "text": "..."
+            }
+        }
+    }
+
+def make_updates(count: int, users: int):
+    """Смесь команд и нажатий кнопок от нескольких пользователей"""
+    callbacks = ["profile", "my_appointments", "appointments_next", "appointments_prev", "ignore"]
+    for _ in range(count):
+        user_id = random.randint(1, users)
+        if random.random() < 0.2:
+            yield make_message_update(user_id, "/start")
+        else:
+            yield make_callback_update(user_id, random.choice(callbacks))
+
+async def post_updates(url: str, secret: str, updates, concurrency: int):
+    """Отправляет апдейты с ограничением параллельности, возвращает (код ответа, задержка) по каждому"""
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    results = []
+
+    async with ClientSession() as session:
+        async def post(update: dict):
+            async with semaphore:
+                started = time.perf_counter()
+                async with session.post(url, json=update, headers=headers) as response:
+                    await response.read()
+                    results.append((response.status, time.perf_counter() - started))
+
+        await asyncio.gather(*(post(update) for update in updates))
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Отправка синтетических апдейтов на локальный вебхук")
+    parser.add_argument("--url", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", default="")
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = asyncio.run(post_updates(
+        args.url, args.secret, list(make_updates(args.count, args.users)), args.concurrency
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for _, latency in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(f"Апдейтов: {len(results)} за {elapsed:.2f} с ({len(results) / elapsed:.1f} в секунду)")
+    print(f"Коды ответа: {statuses}")
+    print(f"Задержка p50: {latencies[len(latencies) // 2] * 1000:.1f} мс, "
+          f"p99: {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000:.1f} мс")
+
+if __name__ == "__main__":
+    main()
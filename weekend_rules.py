@@ -0,0 +1,125 @@
+from calendar import monthrange
+from datetime import date
+from typing import Dict, Any, Set
+
+# Выходные врача хранятся правилами, а не перечислением всех дат:
+#   "weekday_mask" - битовая маска дней недели (бит 0 - понедельник, бит 6 - воскресенье),
+#   "monthly"      - список [день недели, номер в месяце] (1..5, -1 - последний), например [0, 1] - первый понедельник,
+#   "exclude"      - даты, которые рабочие несмотря на правила.
+# Отдельные выходные даты по-прежнему лежат в списке "weekends" пользователя.
+
+def empty_rules() -> Dict[str, Any]:
+    """Возвращает пустой набор правил выходных"""
+    return {"dates": set(), "exclude": set(), "weekday_mask": 0, "monthly": []}
+
+def rules_from_user(user_data: dict) -> Dict[str, Any]:
+    """Собирает правила выходных из записи пользователя в users.json"""
+    stored = user_data.get("weekend_rules", {})
+    return {
+        "dates": set(user_data.get("weekends", [])),
+        "exclude": set(stored.get("exclude", [])),
+        "weekday_mask": stored.get("weekday_mask", 0),
+        "monthly": [list(rule) for rule in stored.get("monthly", [])]
+    }
+
+def rules_to_user(rules: Dict[str, Any]) -> Dict[str, Any]:
+    """Возвращает поля записи пользователя для сохранения правил в users.json"""
+    return {
+        "weekends": sorted(rules["dates"]),
+        "weekend_rules": {
+            "weekday_mask": rules["weekday_mask"],
+            "monthly": rules["monthly"],
+            "exclude": sorted(rules["exclude"])
+        }
+    }
+
+def copy_rules(rules: Dict[str, Any]) -> Dict[str, Any]:
+    """Возвращает независимую копию правил (для временного редактирования)"""
+    return {
+        "dates": set(rules["dates"]),
+        "exclude": set(rules["exclude"]),
+        "weekday_mask": rules["weekday_mask"],
+        "monthly": [list(rule) for rule in rules["monthly"]]
+    }
+
+def is_rule_day_off(rules: Dict[str, Any], day: date) -> bool:
+    """Проверяет, попадает ли день под повторяющиеся правила (без учета дат и исключений)"""
+    weekday = day.weekday()
+    if rules["weekday_mask"] & (1 << weekday):
+        return True
+
+    days_in_month = monthrange(day.year, day.month)[1]
+    for rule_weekday, number in rules["monthly"]:
+        if rule_weekday != weekday:
+            continue
+        if number == -1 and day.day + 7 > days_in_month:
+            return True
+        if number == (day.day - 1) // 7 + 1:
+            return True
+
+    return False
+
+def is_day_off(rules: Dict[str, Any], day: date) -> bool:
+    """Проверяет, является ли день выходным"""
+    date_str = day.isoformat()
+    if date_str in rules["dates"]:
+        return True
+    return date_str not in rules["exclude"] and is_rule_day_off(rules, day)
+
+def days_off_in_month(rules: Dict[str, Any], year: int, month: int) -> Set[str]:
+    """Вычисляет все выходные дни месяца сразу (ISO-даты)"""
+    first_weekday, days_in_month = monthrange(year, month)
+    days = set()
+
+    # Первое число месяца для каждого дня недели, далее - шаг в 7 дней
+    def first_day_of(weekday: int) -> int:
+        return 1 + (weekday - first_weekday) % 7
+
+    for weekday in range(7):
+        if rules["weekday_mask"] & (1 << weekday):
+            days.update(range(first_day_of(weekday), days_in_month + 1, 7))
+
+    for weekday, number in rules["monthly"]:
+        first = first_day_of(weekday)
+        if number == -1:
+            days.add(first + 7 * ((days_in_month - first) // 7))
+        elif first + 7 * (number - 1) <= days_in_month:
+            days.add(first + 7 * (number - 1))
+
+    prefix = f"{year}-{month:02d}-"
+    days_off = {f"{prefix}{day:02d}" for day in days} - rules["exclude"]
+    days_off.update(date_str for date_str in rules["dates"] if date_str.startswith(prefix))
+    return days_off
+
+def days_off_between(rules: Dict[str, Any], start: date, end: date) -> Set[str]:
+    """Вычисляет выходные дни в периоде [start, end] помесячно"""
+    days_off = set()
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        days_off.update(days_off_in_month(rules, year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    start_str, end_str = start.isoformat(), end.isoformat()
+    return {date_str for date_str in days_off if start_str <= date_str <= end_str}
+
+def toggle_weekday(rules: Dict[str, Any], weekday: int) -> None:
+    """Включает/выключает правило «каждый такой день недели»"""
+    rules["weekday_mask"] ^= 1 << weekday
+
+    # Исключения этого дня недели относились к прежнему правилу
+    rules["exclude"] = {
+        date_str for date_str in rules["exclude"]
+        if date.fromisoformat(date_str).weekday() != weekday
+    }
+
+def toggle_date(rules: Dict[str, Any], day: date) -> None:
+    """Переключает выходной для отдельной даты"""
+    date_str = day.isoformat()
+
+    if date_str in rules["dates"]:
+        rules["dates"].discard(date_str)
+    elif is_rule_day_off(rules, day):
+        # День выходной по правилу - отмечаем его как исключение (или снимаем исключение)
+        rules["exclude"] ^= {date_str}
+    else:
+        rules["dates"].add(date_str)